@@ -1,10 +1,28 @@
 import os
 import fitz  # The PyMuPDF library
 import logging
+import hashlib
+import mmap
+import re
+import sys
+import zlib
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+from contextlib import closing
 import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import ahocorasick  # Optional (pyahocorasick): matches all terms in a single pass
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # Optional (python-hyperscan): SIMD scanning for very large archives
+except ImportError:
+    hyperscan = None
 
 # --- DEFAULT CONFIGURATION ---
 DEFAULT_SEARCH_TERMS = [
@@ -17,96 +35,401 @@ DEFAULT_SEARCH_TERMS = [
 ]
 OUTPUT_FILE = "search_report_results.txt"
 
+def _user_cache_dir():
+    """The per-user cache folder of the platform (e.g. %LOCALAPPDATA% on Windows, ~/.cache on Linux)."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'Categorizer', 'pdf_text_cache')
+
+# Extracted report text (patient data) is cached here, keyed by a hash of the PDF contents.
+# The folder is private to the current user; set CACHE_DIR to None to turn the cache off.
+CACHE_DIR = _user_cache_dir()
+# Least recently used entries are deleted after each analysis to keep the cache under this size
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Reports are normally a few MB; anything larger is almost always a scan with no extractable text
+MAX_PDF_BYTES = 50 * 1024 * 1024
+
+# Folder listings are mostly waiting on the disk or network share, so several run at once
+DISCOVERY_THREADS = 8
+
+# Keep whitespace and clip to the page; ligatures are expanded to plain letters, which suits substring matching
+TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
 # --- BACKEND LOGIC (Modified to report progress) ---
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def _list_folder(folder):
+    """Returns (subfolders, pdf_paths) found directly inside a folder."""
+    subfolders, pdf_paths = [], []
+    try:
+        # scandir reports the entry type from the directory listing, avoiding a stat per entry
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subfolders.append(entry.path)
+                elif entry.name.lower().endswith('.pdf'):
+                    pdf_paths.append(entry.path)
+    except OSError as e:
+        logging.error(f"Could not read folder {folder}: {e}")
+    return subfolders, pdf_paths
+
 def get_pdf_paths(folders_to_scan, progress_queue):
-    """Scans folders to find all PDF paths, reporting progress via a queue."""
+    """
+    Scans folders to find all PDF paths, reporting progress via a queue.
+    Subfolders are listed in parallel by a thread pool; the order of the returned paths is not defined.
+    """
     pdf_paths = []
     progress_queue.put(("log", "Phase 1: Discovering PDF files..."))
-    for folder in folders_to_scan:
-        if not os.path.isdir(folder):
-            progress_queue.put(("log", f"Warning: Folder not found, skipping: {folder}"))
-            continue
-        progress_queue.put(("log", f"Scanning folder: {folder}"))
-        for root, _, files in os.walk(folder, topdown=True):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    pdf_paths.append(os.path.join(root, file))
+    with ThreadPoolExecutor(max_workers=DISCOVERY_THREADS) as executor:
+        pending = set()
+        for folder in folders_to_scan:
+            if not os.path.isdir(folder):
+                progress_queue.put(("log", f"Warning: Folder not found, skipping: {folder}"))
+                continue
+            progress_queue.put(("log", f"Scanning folder: {folder}"))
+            pending.add(executor.submit(_list_folder, folder))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subfolders, found_pdfs = future.result()
+                pdf_paths.extend(found_pdfs)
+                pending.update(executor.submit(_list_folder, subfolder) for subfolder in subfolders)
     progress_queue.put(("log", f"Discovery complete. Found {len(pdf_paths)} PDF files."))
     return pdf_paths
 
-def extract_text_from_pdf(pdf_path):
+# Separates pages inside a cache entry so cached text can be streamed page by page
+PAGE_SEPARATOR = "\f"
+
+def _read_cached_text(cache_path):
+    """Returns cached UTF-8 text as bytes, or None if there is no usable cache entry."""
+    try:
+        with open(cache_path, 'rb') as f:
+            text = zlib.decompress(f.read())
+        # Marks the entry as recently used, so pruning removes the entries that are no longer read first
+        os.utime(cache_path)
+        return text
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+
+def _write_cached_text(cache_path, compressed_text):
+    """Stores compressed text in the cache; failures only cost a re-extraction next run."""
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        # Write to a per-process temp file first so parallel workers never see partial entries
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(compressed_text)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write cache entry {cache_path}: {e}")
+
+def prune_text_cache(max_bytes=CACHE_MAX_BYTES):
+    """Deletes the least recently used cache entries until the cache takes at most max_bytes."""
     try:
+        with os.scandir(CACHE_DIR) as entries:
+            cached_files = []
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    cached_files.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        logging.warning(f"Could not list the text cache {CACHE_DIR}: {e}")
+        return
+
+    total_bytes = sum(size for _, size, _ in cached_files)
+    for _, size, path in sorted(cached_files):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total_bytes -= size
+        except OSError as e:
+            logging.warning(f"Could not remove cache entry {path}: {e}")
+
+def iter_pdf_pages(pdf_path, as_bytes=False):
+    """
+    Yields the lowercase text of each page of a PDF, reusing the on-disk cache if the file is unchanged.
+    With as_bytes the pages are UTF-8 bytes, so cached text is never decoded for the bytes matchers.
+    The cache entry is only written once every page has been read: if the caller stops early,
+    nothing is cached, so the early exit never pays for reading the remaining pages.
+    """
+    file_size = os.path.getsize(pdf_path)
+    if file_size > MAX_PDF_BYTES:
+        logging.warning(f"Skipping {pdf_path}: {file_size} bytes exceeds the {MAX_PDF_BYTES} byte limit")
+        return
+    if file_size == 0:
+        return # Empty files cannot be memory-mapped and contain no pages anyway
+
+    if CACHE_DIR is None:
         with fitz.open(pdf_path) as doc:
-            return " ".join(page.get_text("text").lower() for page in doc)
+            for page in doc:
+                page_text = page.get_text("text", flags=TEXT_FLAGS).lower()
+                yield page_text.encode('utf-8') if as_bytes else page_text
+        return
+
+    # Hash through a read-only memory map so the file is never copied into a Python bytes object
+    with open(pdf_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        digest = hashlib.blake2b(mapped, digest_size=16).hexdigest()
+    # The flags are part of the key so a change in extraction settings never reuses stale text
+    cache_path = os.path.join(CACHE_DIR, f"{digest}.{TEXT_FLAGS}.txt.z")
+
+    cached_text = _read_cached_text(cache_path)
+    if cached_text is not None:
+        if as_bytes:
+            yield from cached_text.split(PAGE_SEPARATOR.encode('utf-8'))
+        else:
+            yield from cached_text.decode('utf-8').split(PAGE_SEPARATOR)
+        return
+
+    # Compress pages as they are produced so the full text is never held in memory
+    compressor = zlib.compressobj()
+    compressed_parts = []
+    with fitz.open(pdf_path) as doc:
+        for page_number, page in enumerate(doc):
+            page_text = page.get_text("text", flags=TEXT_FLAGS).lower()
+            page_bytes = page_text.encode('utf-8')
+            if page_number:
+                compressed_parts.append(compressor.compress(PAGE_SEPARATOR.encode('utf-8')))
+            compressed_parts.append(compressor.compress(page_bytes))
+            yield page_bytes if as_bytes else page_text
+    compressed_parts.append(compressor.flush())
+    _write_cached_text(cache_path, b"".join(compressed_parts))
+
+class HyperscanMatcher:
+    """All terms compiled into one Hyperscan database, scanned over UTF-8 bytes."""
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self.database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        # SINGLEMATCH reports each term at most once per scan; the text is already lowercase
+        self.database.compile(
+            expressions=[re.escape(term.encode('utf-8')) for term in self.terms],
+            ids=list(range(len(self.terms))),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self.terms),
+        )
+
+    def find(self, haystack):
+        hits = set()
+        self.database.scan(haystack, match_event_handler=lambda term_id, *_: hits.add(term_id))
+        return {self.terms[term_id] for term_id in hits}
+
+def build_term_matcher(terms):
+    """
+    Builds a single-pass matcher over all terms: a Hyperscan database if python-hyperscan is installed,
+    then an Aho-Corasick automaton if pyahocorasick is, otherwise one compiled regex alternation over
+    the UTF-8 encoded terms. Returns None if there are no terms.
+    """
+    if not terms:
+        return None
+    if hyperscan is not None:
+        return HyperscanMatcher(terms)
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+    # The lookahead reports a match at every position; longest first so it is the longest term starting there
+    alternatives = b"|".join(re.escape(term.encode('utf-8')) for term in sorted(set(terms), key=len, reverse=True))
+    return re.compile(b"(?=(" + alternatives + b"))")
+
+def matches_bytes(matcher):
+    """The regex and Hyperscan matchers work on UTF-8 bytes, the automaton on str."""
+    return isinstance(matcher, (re.Pattern, HyperscanMatcher))
+
+# Letters from most to least common in English text; anything else counts as common
+LETTER_COMMONNESS = "etaoinshrdlcumwfgypbvkjxqz"
+
+def _rarity(char):
+    position = LETTER_COMMONNESS.find(char)
+    return position if position >= 0 else 0
+
+def build_prefilter(terms, as_bytes):
+    """
+    Picks the rarest-looking character pair of each term (Volnitsky-style prefilter).
+    Every occurrence of a term contains its pair, so a page with none of the pairs cannot contain any term.
+    """
+    pairs = set()
+    for term in terms:
+        if len(term) < 2:
+            pair = term
+        else:
+            pair = max((term[i:i + 2] for i in range(len(term) - 1)),
+                       key=lambda bigram: _rarity(bigram[0]) + _rarity(bigram[1]))
+        pairs.add(pair.encode('utf-8') if as_bytes else pair)
+    return pairs
+
+def find_terms(text, matcher, contained_terms):
+    """
+    Returns the set of terms that occur in the text.
+    contained_terms maps each term to every term it contains, covering shorter terms hidden by a longer regex match.
+    """
+    if matcher is None:
+        return set()
+    if isinstance(matcher, HyperscanMatcher):
+        return matcher.find(text) # Hyperscan reports overlapping terms itself
+    if matches_bytes(matcher):
+        found_terms = set()
+        for match in set(matcher.findall(text)):
+            found_terms |= contained_terms[match.decode('utf-8')]
+        return found_terms
+    return {term for _, term in matcher.iter(text)}
+
+def scan_pdf(pdf_path, matcher, contained_terms, negated_term_by_phrase, prefilter):
+    """
+    Scans a PDF one page at a time and returns the matched terms, minus those whose negative phrase was found.
+    Negative phrases are patterns of the same matcher, so one pass per page finds both.
+    The tail of the previous page is carried over so matches spanning a page break are not missed.
+    """
+    found_patterns = set()
+    negated_terms = set()
+    as_bytes = matches_bytes(matcher)
+    # The bytes matchers get UTF-8 pages straight from the cache, so the overlap is measured in bytes
+    overlap = max((len(pattern.encode('utf-8') if as_bytes else pattern) for pattern in contained_terms), default=1) - 1
+    separator = b" " if as_bytes else " "
+    previous_tail = separator[:0]
+    try:
+        # Closed right away on an early exit, so the PDF is released now rather than when the generator is collected
+        with closing(iter_pdf_pages(pdf_path, as_bytes)) as pages:
+            for page_text in pages:
+                haystack = previous_tail + separator + page_text if previous_tail else page_text
+                previous_tail = haystack[max(0, len(haystack) - overlap):]
+                # A few fast substring checks rule out most pages before the full matcher runs
+                if not any(pair in haystack for pair in prefilter):
+                    continue
+                page_patterns = find_terms(haystack, matcher, contained_terms)
+                found_patterns |= page_patterns
+                negated_terms.update(negated_term_by_phrase[pattern] for pattern in page_patterns if pattern in negated_term_by_phrase)
+                if len(negated_terms) == len(negated_term_by_phrase):
+                    break # Every term is ruled out; the remaining pages cannot change the result
     except Exception as e:
         logging.error(f"Failed to read or process {pdf_path}: {e}")
-        return None
+        return set()
+    return found_patterns - negated_terms
+
+# Search terms for the current analysis, set once per worker process by _init_worker
+_worker_terms_with_acute = set()
+_worker_terms_without_acute = set()
+_worker_contained_terms = {}
+_worker_matcher = None
+_worker_negated_term_by_phrase = {}
+_worker_prefilter = set()
+
+def _init_worker(terms_with_acute, terms_without_acute, negative_phrases):
+    """
+    Builds the matcher once per worker process and keeps it, with the search terms, in module globals,
+    so neither is pickled or rebuilt for every task.
+    """
+    global _worker_terms_with_acute, _worker_terms_without_acute, _worker_contained_terms, _worker_matcher, _worker_negated_term_by_phrase, _worker_prefilter
+    _worker_terms_with_acute = set(terms_with_acute)
+    _worker_terms_without_acute = set(terms_without_acute)
+    all_terms = _worker_terms_with_acute | _worker_terms_without_acute
+    _worker_negated_term_by_phrase = {phrase: term for term, phrase in negative_phrases.items() if term in all_terms}
+    all_patterns = all_terms | set(_worker_negated_term_by_phrase)
+    _worker_contained_terms = {pattern: {other for other in all_patterns if other in pattern} for pattern in all_patterns}
+    _worker_matcher = matcher = build_term_matcher(sorted(all_patterns))
+    # Every negative phrase contains its term, so the term pairs alone are enough for the prefilter
+    _worker_prefilter = build_prefilter(all_terms, matches_bytes(matcher))
 
-def find_and_process_pdfs(all_pdfs, terms_with_acute, terms_without_acute, progress_queue):
-    """Processes a list of PDFs, applying positive match logic and reporting progress."""
+def _scan_one(pdf_path):
+    """Scans one PDF and returns the terms it positively matches."""
+    positive_terms = scan_pdf(pdf_path, _worker_matcher, _worker_contained_terms, _worker_negated_term_by_phrase, _worker_prefilter)
+    return pdf_path, positive_terms & _worker_terms_with_acute, positive_terms & _worker_terms_without_acute
+
+def set_bit(bits, index):
+    bits[index >> 3] |= 1 << (index & 7)
+
+def iter_set_bits(bits):
+    """Yields the indices of all set bits in ascending order."""
+    for byte_index, byte in enumerate(bits):
+        if byte:
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield (byte_index << 3) | bit
+
+def count_union_bits(bitsets):
+    """Counts the indices set in any of the given bitsets."""
+    union = 0
+    for bits in bitsets:
+        union |= int.from_bytes(bits, 'little')
+    return bin(union).count("1")
+
+def find_and_process_pdfs(all_pdfs, terms_with_acute, terms_without_acute, negative_phrases, progress_queue):
+    """
+    Processes a list of PDFs in parallel, applying positive match logic and reporting progress.
+    Matches are returned per term as bitsets over the indices of all_pdfs.
+    """
     progress_queue.put(("log", "\nPhase 2: Analyzing report content..."))
     
+    total_files = len(all_pdfs)
+    bitset_size = (total_files + 7) // 8
     exact_match_counts = {term: 0 for term in terms_with_acute}
     partial_match_counts = {term: 0 for term in terms_without_acute}
-    exact_match_files = {term: set() for term in terms_with_acute}
-    partial_match_files = {term: set() for term in terms_without_acute}
+    exact_match_bits = {term: bytearray(bitset_size) for term in terms_with_acute}
+    partial_match_bits = {term: bytearray(bitset_size) for term in terms_without_acute}
     
-    total_files = len(all_pdfs)
-    for i, pdf_path in enumerate(all_pdfs):
-        # Update progress bar and log the current file
-        progress_value = int(((i + 1) / total_files) * 100)
-        progress_queue.put(("progress", progress_value))
-        progress_queue.put(("log", f"Analyzing [{i+1}/{total_files}]: {os.path.basename(pdf_path)}"))
-        
-        full_text = extract_text_from_pdf(pdf_path)
-        if full_text:
-            for term in terms_with_acute:
-                negative_phrase = f"no evidence of {term}"
-                if term in full_text and negative_phrase not in full_text:
-                    exact_match_counts[term] += 1
-                    exact_match_files[term].add(pdf_path)
-            for term in terms_without_acute:
-                negative_phrase = f"no evidence of {term}"
-                if term in full_text and negative_phrase not in full_text:
-                    partial_match_counts[term] += 1
-                    partial_match_files[term].add(pdf_path)
+    max_workers = os.cpu_count() or 1
+    # Larger chunks cut inter-process overhead, but keep enough chunks to balance the workers
+    chunksize = max(1, min(16, total_files // (max_workers * 4)))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(terms_with_acute, terms_without_acute, negative_phrases)) as executor:
+        results = executor.map(_scan_one, all_pdfs, chunksize=chunksize)
+        for i, (pdf_path, exact_hits, partial_hits) in enumerate(results):
+            # Update progress bar and log the current file
+            progress_value = int(((i + 1) / total_files) * 100)
+            progress_queue.put(("progress", progress_value))
+            progress_queue.put(("log", f"Analyzed [{i+1}/{total_files}]: {os.path.basename(pdf_path)}"))
+
+            for term in exact_hits:
+                exact_match_counts[term] += 1
+                set_bit(exact_match_bits[term], i)
+            for term in partial_hits:
+                partial_match_counts[term] += 1
+                set_bit(partial_match_bits[term], i)
+
+    if CACHE_DIR is not None:
+        prune_text_cache()
                     
-    return exact_match_files, partial_match_files, exact_match_counts, partial_match_counts
-
-def write_report(exact_files_dict, partial_files_dict, exact_counts, partial_counts, terms_with_acute, terms_without_acute):
-    report_lines = ["--- Search Results ---"]
-    # ... (Reporting logic is unchanged) ...
-    report_lines.extend([f"\n{'='*55}", "## 1. List 1: Reports with original terms", f"{'='*55}", "### Individual Term Counts:"])
-    total_exact_files = set()
-    for term in sorted(exact_counts.keys()):
-        count = exact_counts[term]
-        report_lines.append(f"  - {term:<25}: {count} reports")
-        total_exact_files.update(exact_files_dict.get(term, set()))
-    report_lines.extend([f"\n### Total Unique Reports in this Category: {len(total_exact_files)}", "--- File List ---"])
-    for term in terms_with_acute:
-        files = sorted(list(exact_files_dict.get(term, set())))
-        if files:
-            report_lines.append(f"\n#### Files containing '{term}':")
-            report_lines.extend(f"- {file_path}" for file_path in files)
-    report_lines.extend([f"\n{'='*55}", "## 2. List 2: Reports with terms excluding 'acute'", f"{'='*55}", "### Individual Term Counts:"])
-    total_partial_files = set()
-    for term in sorted(partial_counts.keys()):
-        count = partial_counts[term]
-        report_lines.append(f"  - {term:<25}: {count} reports")
-        total_partial_files.update(partial_files_dict.get(term, set()))
-    report_lines.extend([f"\n### Total Unique Reports in this Category: {len(total_partial_files)}", "--- File List ---"])
-    for term in terms_without_acute:
-        files = sorted(list(partial_files_dict.get(term, set())))
-        if files:
-            report_lines.append(f"\n#### Files containing '{term}':")
-            report_lines.extend(f"- {file_path}" for file_path in files)
-    report_lines.append("\n--- End of Report ---")
-    
+    return exact_match_bits, partial_match_bits, exact_match_counts, partial_match_counts
+
+def write_report(all_pdfs, exact_bits_dict, partial_bits_dict, exact_counts, partial_counts, terms_with_acute, terms_without_acute):
+    """Streams the report to OUTPUT_FILE line by line instead of building it in memory first."""
     try:
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            f.write("\n".join(report_lines))
+        with open(OUTPUT_FILE, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            def emit(line):
+                f.write(line)
+                f.write("\n")
+
+            def emit_section(title, counts, bits_dict, terms):
+                for line in [f"\n{'='*55}", title, f"{'='*55}", "### Individual Term Counts:"]:
+                    emit(line)
+                for term in terms:
+                    emit(f"  - {term:<25}: {counts[term]} reports")
+                emit(f"\n### Total Unique Reports in this Category: {count_union_bits(bits_dict.values())}")
+                emit("--- File List ---")
+                for term in terms:
+                    # all_pdfs is sorted, so set bits come out in sorted path order
+                    indices = iter_set_bits(bits_dict[term])
+                    first_index = next(indices, None)
+                    if first_index is not None:
+                        emit(f"\n#### Files containing '{term}':")
+                        emit(f"- {all_pdfs[first_index]}")
+                        for i in indices:
+                            emit(f"- {all_pdfs[i]}")
+
+            emit("--- Search Results ---")
+            emit_section("## 1. List 1: Reports with original terms", exact_counts, exact_bits_dict, terms_with_acute)
+            emit_section("## 2. List 2: Reports with terms excluding 'acute'", partial_counts, partial_bits_dict, terms_without_acute)
+            emit("\n--- End of Report ---")
         return True
     except Exception as e:
         logging.error(f"Could not write report to file: {e}")
@@ -241,17 +564,20 @@ class PdfSearchApp:
 
     def run_analysis(self):
         folders_to_scan = [f for f in [self.reports_folder, self.main_folder] if f]
-        all_pdfs = get_pdf_paths(folders_to_scan, self.progress_queue)
+        # Sorted once so per-term results can be reported in path order straight from the bitsets
+        all_pdfs = sorted(get_pdf_paths(folders_to_scan, self.progress_queue))
         
         search_terms = list(self.terms_listbox.get(0, tk.END))
-        terms_with_acute = sorted([term for term in search_terms])
-        terms_without_acute = sorted(list(set([term.replace('acute ', '') for term in terms_with_acute])))
+        # Sorted once here; the counts and report sections follow this order without re-sorting
+        terms_with_acute = sorted(search_terms)
+        terms_without_acute = sorted({term.replace('acute ', '') for term in terms_with_acute})
+        negative_phrases = {term: f"no evidence of {term}" for term in terms_with_acute + terms_without_acute}
         
-        exact_files, partial_files, exact_counts, partial_counts = find_and_process_pdfs(
-            all_pdfs, terms_with_acute, terms_without_acute, self.progress_queue
+        exact_bits, partial_bits, exact_counts, partial_counts = find_and_process_pdfs(
+            all_pdfs, terms_with_acute, terms_without_acute, negative_phrases, self.progress_queue
         )
         
-        write_report(exact_files, partial_files, exact_counts, partial_counts, terms_with_acute, terms_without_acute)
+        write_report(all_pdfs, exact_bits, partial_bits, exact_counts, partial_counts, terms_with_acute, terms_without_acute)
         self.progress_queue.put(("complete", None))
 
     def analysis_complete(self):
@@ -261,6 +587,8 @@ class PdfSearchApp:
         self.progress_bar['value'] = 100
 
 if __name__ == "__main__":
+    # Required for the worker processes when running as a frozen executable
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = PdfSearchApp(root)
     root.mainloop()
\ No newline at end of file
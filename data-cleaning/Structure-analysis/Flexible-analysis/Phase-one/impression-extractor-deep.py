@@ -23,6 +23,8 @@ STOP_KEYWORDS = [
     'advice:', 'note:', 'correlation:', 'follow-up:', 'follow up:',
     '*** end of report ***', 'electronically signed', 'page 1 of', 'page 2 of'
 ]
+# All stop keywords as one pattern, so a single search finds the earliest of them
+STOP_KEYWORDS_RE = re.compile("|".join(re.escape(keyword) for keyword in STOP_KEYWORDS))
 
 # --- NEW FEATURE: INDEX FILE ---
 INDEX_FILE = "pdf_index.txt"
@@ -34,23 +36,32 @@ logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %
 def stream_pdfs(folders_to_scan):
     """
     A generator that finds and 'yields' one PDF path at a time.
-    It uses os.walk to correctly search through both flat and nested directories.
+    It walks both flat and nested directories using os.scandir.
     """
     for folder in folders_to_scan:
         if not os.path.isdir(folder):
             tqdm.write(f"Warning: Folder not found, skipping: {folder}")
             continue
-        # os.walk traverses the entire directory tree, making it perfect for both folder structures.
-        for root, _, files in os.walk(folder, topdown=True):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    yield os.path.join(root, file)
+        pending_dirs = [folder]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                # scandir reports the entry type from the directory listing, avoiding a stat per entry
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif entry.name.lower().endswith('.pdf'):
+                            yield entry.path
+            except OSError as e:
+                logging.error(f"Could not read folder {current_dir}: {e}")
 
 def extract_text_from_pdf(pdf_path):
     """Reads all text from a PDF and returns it as a single lowercase string."""
     try:
         with fitz.open(pdf_path) as doc:
-            return " ".join(page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE).lower() for page in doc)
+            # Lowercase the joined text in one pass rather than allocating a lowercase copy of every page
+            return " ".join(page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE) for page in doc).lower()
     except Exception as e:
         tqdm.write(f"  -> Skipping corrupted/unreadable file: {os.path.basename(pdf_path)} ({e})")
         return None
@@ -75,18 +86,9 @@ def extract_impression(full_text):
         return None
 
     end_index = len(full_text)
-    first_stop_pos = -1
-
-    for keyword in STOP_KEYWORDS:
-        try:
-            pos = full_text.index(keyword, start_index)
-            if first_stop_pos == -1 or pos < first_stop_pos:
-                first_stop_pos = pos
-        except ValueError:
-            continue
-    
-    if first_stop_pos != -1:
-        end_index = first_stop_pos
+    stop_match = STOP_KEYWORDS_RE.search(full_text, start_index)
+    if stop_match:
+        end_index = stop_match.start()
 
     impression_text = full_text[start_index:end_index].strip()
     impression_text = re.sub(r'\s+', ' ', impression_text).strip()
@@ -23,6 +23,8 @@ STOP_KEYWORDS = [
     'dr.', 'md', 'dnb', 'consultant radiologist', 'provisional report',
     '*** end of report ***'
 ]
+# All stop keywords as one pattern, so a single search finds the earliest of them
+STOP_KEYWORDS_RE = re.compile("|".join(re.escape(keyword) for keyword in STOP_KEYWORDS))
 
 # --- SCRIPT ---
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -44,7 +46,8 @@ def extract_text_from_pdf(pdf_path):
     """Reads all text from a PDF and returns it as a single lowercase string."""
     try:
         with fitz.open(pdf_path) as doc:
-            return " ".join(page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE).lower() for page in doc)
+            # Lowercase the joined text in one pass rather than allocating a lowercase copy of every page
+            return " ".join(page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE) for page in doc).lower()
     except Exception as e:
         # This will catch MuPDF errors for corrupted files
         tqdm.write(f"  -> Skipping corrupted/unreadable file: {os.path.basename(pdf_path)} ({e})")
@@ -73,18 +76,9 @@ def extract_impression(full_text):
     # Step 2: Find the Ending Point
     # Find the earliest occurrence of any stop keyword after the impression starts
     end_index = len(full_text) # Default to the end of the text
-    first_stop_pos = -1
-
-    for keyword in STOP_KEYWORDS:
-        try:
-            pos = full_text.index(keyword, start_index)
-            if first_stop_pos == -1 or pos < first_stop_pos:
-                first_stop_pos = pos
-        except ValueError:
-            continue # Keyword not found
-    
-    if first_stop_pos != -1:
-        end_index = first_stop_pos
+    stop_match = STOP_KEYWORDS_RE.search(full_text, start_index)
+    if stop_match:
+        end_index = stop_match.start()
 
     # Step 3: Extract and Clean the Text
     impression_text = full_text[start_index:end_index].strip()
@@ -133,24 +127,28 @@ def main():
     else:
         # Original behavior: scan folders
         print("No custom index. Scanning configured folders...")
-        all_pdfs = list(stream_pdfs(FOLDERS_TO_SCAN))
     # --- MODIFICATION END ---
     
-    if not all_pdfs:
+    if args.index and not all_pdfs:
         print("No PDF files found to process. Exiting.")
         return
 
+    # Folder scans are streamed so processing starts with the first PDF found; the total is unknown until the end
+    pdf_source = all_pdfs if args.index else stream_pdfs(FOLDERS_TO_SCAN)
+    total = len(all_pdfs) if args.index else None
+
     all_impressions = []
     filter_keyword_lower = FILTER_KEYWORD.lower()
+    processed_count = 0
     
-    with tqdm(total=len(all_pdfs), desc="Processing Reports", unit="file") as pbar:
-        for pdf_path in all_pdfs:
+    with tqdm(pdf_source, total=total, desc="Processing Reports", unit="file") as pbar:
+        for pdf_path in pbar:
+            processed_count += 1
             filename = os.path.basename(pdf_path)
             pbar.set_postfix_str(f"Checking: {filename}", refresh=True)
 
             full_text = extract_text_from_pdf(pdf_path)
             if not full_text:
-                pbar.update(1)
                 continue
 
             # Check if the keyword exists in the filename OR the content
@@ -164,8 +162,10 @@ def main():
                     tqdm.write("Impression extracted successfully.")
                 else:
                     tqdm.write("'Impression' section not found in this report.")
-            
-            pbar.update(1)
+
+    if not processed_count:
+        print("No PDF files found to process. Exiting.")
+        return
 
     # Write all found impressions to the output file
     if all_impressions:
@@ -0,0 +1,575 @@
+import os
+import fitz  # The PyMuPDF library
+from tqdm import tqdm
+import logging
+import re
+import argparse
+import sys
+import hashlib
+import json
+import sqlite3
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import ahocorasick  # Optional (pyahocorasick): matches terms and negative keywords in one pass
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # Optional (python-hyperscan): SIMD multi-pattern scanning, preferred over pyahocorasick
+except ImportError:
+    hyperscan = None
+
+# --- DEFAULT CONFIGURATION ---
+# The per-site scripts (selective_search_deep.py, selective_search_lucknow.py, local-search.py)
+# override these by passing their own settings to main().
+
+SEARCH_TERMS = [
+    "appendicitis",
+    "acute appendicitis",
+    "chronic appendicitis",
+    "appendicitis with collection or abscess",
+    "rupture appendicitis",
+    "acute pancreatitis",
+    "chronic pancreatitis",
+    "Pancreatitis",
+    "modified ctsi",
+    "pancreatitis with collection",
+]
+
+OUTPUT_FILE = "search_report_results.txt"
+
+# Negative Keywords for Sentence-Level Check (lowercase)
+# Consider expanding this list based on common radiological phrasing
+NEGATIVE_KEYWORDS = frozenset([
+    "no evidence", "not seen", "negative for", "ruled out", "unlikely",
+    "absent", "without signs of", "is unremarkable", "no definite",
+    "no significant", "no obvious", "no acute", "normal appendix",
+    "appendix is normal", "no features of", "no sign of",
+    "scan negative for", "no suspicion of", "scan does not show",
+    "no imaging findings of", "no ct evidence of"
+])
+
+# Separates the scanned folders on the first line of an index file
+INDEX_FOLDER_SEPARATOR = "|"
+
+# Text extraction flags: keep whitespace and clip to the page, but skip ligature preservation and image blocks.
+# Ligatures are expanded to plain letters, which is what substring matching needs anyway.
+TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+# PDFs are analyzed in worker processes and handed out a few at a time
+MAX_WORKERS = min(os.cpu_count() or 1, 8)
+# Upper bound on PDFs handed to the workers but not yet collected, so memory stays flat on huge archives
+MAX_PENDING_PDFS = 256
+
+def _user_cache_dir():
+    """The per-user cache folder of the platform (e.g. %LOCALAPPDATA% on Windows, ~/.cache on Linux)."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'Categorizer', 'scan_cache')
+
+# Per-PDF results (which terms each report contains) are remembered here, keyed by path,
+# modification time, size and search settings. The folder is private to the current user.
+SCAN_CACHE_FILE = os.path.join(_user_cache_dir(), "scan_cache.db")
+# Cache rows are written in batches of this size
+SCAN_CACHE_BATCH = 500
+
+# A few pathological PDFs take seconds per page; stop reading a PDF once its pages have taken this long
+PDF_TIME_BUDGET_SECONDS = 20
+
+# --- SCRIPT ---
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def stream_pdfs(folders_to_scan, recursive=True):
+    """
+    A generator that finds and 'yields' one PDF path at a time.
+    Walks subdirectories with os.scandir when recursive is True, otherwise only looks directly inside each folder.
+    """
+    for folder in folders_to_scan:
+        if not os.path.isdir(folder):
+            tqdm.write(f"Warning: Folder not found, skipping: {folder}")
+            continue
+        pending_dirs = [folder]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                # scandir reports the entry type from the directory listing, avoiding a stat per entry
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                pending_dirs.append(entry.path)
+                        elif entry.name.lower().endswith('.pdf'):
+                            yield entry.path
+            except OSError as e:
+                logging.error(f"Could not read folder {current_dir}: {e}")
+
+def split_sentences_regex(full_text):
+    """Splits text on '.', '?' or '!' followed by whitespace, dropping empty sentences."""
+    sentences = re.split(r'[.?!]\s+', full_text)
+    return [s.strip() for s in sentences if s.strip()]
+
+# Everything up to and including the last sentence break ('.', '?' or '!' followed by whitespace)
+COMPLETE_SENTENCES_RE = re.compile(r'.*[.?!]\s+', re.DOTALL)
+
+def split_complete_sentences(chunk, split_sentences):
+    r"""
+    Splits page text into its complete sentences and the unfinished text after the last sentence break,
+    which may continue on the next page. A page ending in a full stop leaves nothing to carry over.
+    The carried text is kept as is, so joining it to the next page gives the same text as joining whole pages.
+
+    >>> split_complete_sentences("impression: acute appendicitis.\n", split_sentences_regex)
+    (['impression: acute appendicitis'], '')
+    >>> split_complete_sentences("no abscess. the appendix is\n", split_sentences_regex)
+    (['no abscess'], 'the appendix is\n')
+    """
+    complete = COMPLETE_SENTENCES_RE.match(chunk)
+    if not complete:
+        return [], chunk if chunk.strip() else ""
+    carry = chunk[complete.end():]
+    return split_sentences(chunk[:complete.end()]), carry if carry.strip() else ""
+
+def get_sentence_splitter(name):
+    """Returns the sentence splitting function for 'regex' or 'nltk'."""
+    if name == "regex":
+        return split_sentences_regex
+    if name == "nltk":
+        import nltk # Only needed for the nltk splitter
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            print("First-time setup: Downloading 'punkt' tokenizer for sentence analysis...")
+            nltk.download('punkt')
+            print("Download complete.")
+        return nltk.sent_tokenize
+    raise ValueError(f"Unknown sentence splitter: {name}")
+
+class HyperscanMatcher:
+    """
+    All patterns compiled into one case-insensitive Hyperscan database.
+    iter() mirrors pyahocorasick's Automaton.iter(), yielding (end_index, pattern) pairs.
+    """
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        # SINGLEMATCH reports each pattern at most once per scan; UTF8 + UCP make CASELESS Unicode-aware
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        self.database.compile(
+            expressions=[re.escape(pattern.encode('utf-8')) for pattern in self.patterns],
+            ids=list(range(len(self.patterns))),
+            flags=[flags] * len(self.patterns),
+        )
+
+    def iter(self, text):
+        hits = []
+        self.database.scan(text.encode('utf-8'),
+                           match_event_handler=lambda pattern_id, start, end, *_: hits.append((end - 1, self.patterns[pattern_id])))
+        return hits
+
+def build_sentence_matcher(terms, negative_keywords):
+    """
+    Builds one matcher over the search terms and negative keywords: a Hyperscan database if python-hyperscan
+    is installed, otherwise an Aho-Corasick automaton. Returns None if neither library is installed.
+    """
+    if hyperscan is not None:
+        return HyperscanMatcher(sorted(set(terms) | set(negative_keywords)))
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in set(terms) | set(negative_keywords):
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+def find_positive_terms(sentences, terms, negative_keywords, matcher=None):
+    """Returns the terms that appear in at least one sentence without a negative keyword."""
+    if matcher is not None:
+        found_terms = set()
+        for sentence in sentences:
+            # One pass per sentence finds both the terms and any negative keywords
+            hits = {pattern for _, pattern in matcher.iter(sentence)}
+            if hits and hits.isdisjoint(negative_keywords):
+                found_terms |= hits
+        return found_terms.intersection(terms)
+
+    # Check negation once per sentence instead of once per (sentence, term) pair
+    positive_sentences = [s for s in sentences if not any(neg_kw in s for neg_kw in negative_keywords)]
+    return {term for term in terms if any(term in sentence for sentence in positive_sentences)}
+
+def analyze_pdf(pdf_path, terms, negative_keywords, split_sentences, matcher=None, filter_phrases=None):
+    """
+    Reads a PDF page by page and returns (found_terms, filter_matched, truncated); found_terms is None if the PDF is unreadable.
+    Sentences are analyzed as soon as they are complete, and reading stops once every term
+    has been found and the filter (if any) has matched, so later pages are never parsed.
+    Pages past PDF_TIME_BUDGET_SECONDS are skipped as well, with a warning in the log, and truncated is set.
+    """
+    found_terms = set()
+    filter_matched = not filter_phrases
+    carry = "" # The last sentence of a page may continue on the next one
+    truncated = False
+    started = time.perf_counter()
+    try:
+        with fitz.open(pdf_path) as doc:
+            last_page = len(doc) - 1
+            for page_number, page in enumerate(doc):
+                # sort=True gives a better reading order for multi-column reports
+                page_text = page.get_text("text", flags=TEXT_FLAGS, sort=True)
+                # Always lowercased, so every matcher and sentence splitter sees the same text and the cached results agree
+                page_text = page_text.lower()
+                chunk = carry + " " + page_text if carry else page_text
+                if not filter_matched:
+                    filter_matched = any(phrase in chunk for phrase in filter_phrases)
+                if page_number < last_page:
+                    sentences, carry = split_complete_sentences(chunk, split_sentences)
+                else:
+                    sentences, carry = split_sentences(chunk), ""
+                found_terms |= find_positive_terms(sentences, terms, negative_keywords, matcher)
+                if filter_matched and found_terms.issuperset(terms):
+                    break
+                # MuPDF cannot be interrupted mid-page, so the budget is checked between pages
+                if page_number < last_page and time.perf_counter() - started > PDF_TIME_BUDGET_SECONDS:
+                    logging.warning(f"Stopped reading {os.path.basename(pdf_path)} after page {page_number + 1} "
+                                    f"of {last_page + 1}: over the {PDF_TIME_BUDGET_SECONDS}s budget")
+                    found_terms |= find_positive_terms([carry] if carry else [], terms, negative_keywords, matcher)
+                    truncated = True
+                    break
+    except Exception as e:
+        # Log errors instead of printing to avoid cluttering the progress bar
+        logging.error(f"Skipping corrupted/unreadable file: {os.path.basename(pdf_path)} ({e})")
+        return None, False, False
+    return found_terms, filter_matched, truncated
+
+# Search settings for the current run, set once per worker process by _init_worker
+_worker_terms = ()
+_worker_negative_keywords = frozenset()
+_worker_filter_phrases = ()
+_worker_split_sentences = split_sentences_regex
+_worker_matcher = None
+
+def _init_worker(terms, negative_keywords, filter_phrases, split_sentences):
+    """Keeps the search settings and matcher in module globals so they are not pickled for every task."""
+    global _worker_terms, _worker_negative_keywords, _worker_filter_phrases, _worker_split_sentences, _worker_matcher
+    _worker_terms = terms
+    _worker_negative_keywords = negative_keywords
+    _worker_filter_phrases = filter_phrases
+    _worker_split_sentences = split_sentences
+    _worker_matcher = build_sentence_matcher(terms, negative_keywords)
+
+def _analyze_one(pdf_path, check_filter):
+    """Worker process entry point: returns (pdf_path, found_terms, filter_matched, truncated)."""
+    found_terms, filter_matched, truncated = analyze_pdf(
+        pdf_path, _worker_terms, _worker_negative_keywords, _worker_split_sentences, _worker_matcher,
+        _worker_filter_phrases if check_filter else None
+    )
+    return pdf_path, found_terms, filter_matched, truncated
+
+def scan_settings_key(terms, negative_keywords, filter_phrases, split_sentences):
+    """Identifies the search settings a cached result was computed with."""
+    settings = [sorted(set(terms)), sorted(negative_keywords), sorted(filter_phrases),
+                f"{split_sentences.__module__}.{split_sentences.__qualname__}", TEXT_FLAGS]
+    return hashlib.sha1(json.dumps(settings).encode('utf-8')).hexdigest()
+
+def open_scan_cache(cache_filename):
+    cache_dir = os.path.dirname(cache_filename)
+    if cache_dir:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    connection = sqlite3.connect(cache_filename)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS scan_cache (path TEXT, settings TEXT, mtime INTEGER, size INTEGER,"
+        " hits TEXT, filter_matched INTEGER, PRIMARY KEY (path, settings))"
+    )
+    return connection
+
+def lookup_cached_result(connection, settings, pdf_path):
+    """
+    Returns (cached_result, file_stat): the stored (found_terms, filter_matched) if the PDF is unchanged since
+    it was cached (otherwise None), and its (mtime_ns, size), or None if it cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(pdf_path)
+    except OSError:
+        return None, None # The worker reports unreadable files
+    file_stat = (stat.st_mtime_ns, stat.st_size)
+    row = connection.execute(
+        "SELECT hits, filter_matched FROM scan_cache WHERE path = ? AND settings = ? AND mtime = ? AND size = ?",
+        (pdf_path, settings, *file_stat)
+    ).fetchone()
+    if row:
+        return (set(json.loads(row[0])), bool(row[1])), file_stat
+    return None, file_stat
+
+def store_cached_results(connection, rows):
+    connection.executemany("INSERT OR REPLACE INTO scan_cache VALUES (?, ?, ?, ?, ?, ?)", rows)
+    connection.commit()
+
+def find_and_process_pdfs(all_pdfs, terms_to_search, negative_keywords=NEGATIVE_KEYWORDS,
+                          filter_phrases=None, split_sentences=split_sentences_regex, scan_cache_file=SCAN_CACHE_FILE):
+    """
+    Finds and processes PDFs using sentence-level analysis.
+    all_pdfs may be a generator (e.g. stream_pdfs): PDFs are handed to the workers as soon as they are discovered.
+    Optionally filters PDFs by any of the given phrases in the filename or content.
+    Results of unchanged PDFs are reused from scan_cache_file (set it to None to always re-analyze).
+    Returns:
+        tuple: (target_pdfs, match_indexes, total_unique_count), where target_pdfs is the sorted list of
+        PDFs seen and match_indexes maps each term to the indexes into it of the reports that contain it
+    """
+    print("Starting analysis (sentence-level)... Press Ctrl+C to stop.")
+    filter_phrases_lower = [phrase.lower() for phrase in filter_phrases] if filter_phrases else []
+    if filter_phrases:
+        # Filenames are checked as PDFs arrive; the content check happens in the same pass as the analysis
+        print(f"Filtering for reports containing any of: {filter_phrases}...")
+    else:
+        print("Analyzing all reports (no filter).")
+
+    # Compact arrays of indexes into pdf_paths instead of sets of path strings
+    match_indexes = {term: array('I') for term in terms_to_search}
+    pdf_paths = [] # Every PDF seen, in the order it arrived
+    filtered_count = 0
+    connection = open_scan_cache(scan_cache_file) if scan_cache_file else None
+    settings = scan_settings_key(terms_to_search, negative_keywords, filter_phrases_lower, split_sentences)
+    cached_count = 0
+    pending_rows = []
+
+    def record(pdf_index, found_terms, filter_matched):
+        nonlocal filtered_count
+        if not filter_matched or found_terms is None:
+            return
+        filtered_count += 1
+        # A term counts if it appears in at least one non-negated sentence; each PDF is visited once
+        for term in found_terms:
+            match_indexes[term].append(pdf_index)
+
+    def collect(futures):
+        nonlocal pending_rows
+        for future in futures:
+            pdf_index, file_stat = pending.pop(future)
+            _, found_terms, filter_matched, truncated = future.result()
+            # Partial results of PDFs cut short by the time budget are not cached, so later runs read them in full
+            if connection and found_terms is not None and file_stat and not truncated:
+                pending_rows.append((pdf_paths[pdf_index], settings, *file_stat, json.dumps(sorted(found_terms)), filter_matched))
+                if len(pending_rows) >= SCAN_CACHE_BATCH:
+                    store_cached_results(connection, pending_rows)
+                    pending_rows = []
+            record(pdf_index, found_terms, filter_matched)
+            pbar.update(1)
+
+    total = len(all_pdfs) if hasattr(all_pdfs, '__len__') else None # Unknown while the folders are still being walked
+    # Text extraction is CPU-bound, so PDFs are analyzed in worker processes while discovery continues here
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=_init_worker,
+                             initargs=(terms_to_search, negative_keywords, filter_phrases_lower, split_sentences)) as executor, \
+         tqdm(total=total, desc="Analyzing Reports", unit="pdf", leave=True) as pbar:
+        pending = {} # future -> (pdf_index, file_stat)
+        for pdf_path in all_pdfs:
+            pdf_index = len(pdf_paths)
+            pdf_paths.append(pdf_path)
+            cached_result, file_stat = lookup_cached_result(connection, settings, pdf_path) if connection else (None, None)
+            if cached_result is not None:
+                cached_count += 1
+                record(pdf_index, *cached_result)
+                pbar.update(1)
+                continue
+            filename = os.path.basename(pdf_path).lower()
+            check_filter = bool(filter_phrases) and not any(phrase in filename for phrase in filter_phrases_lower)
+            pending[executor.submit(_analyze_one, pdf_path, check_filter)] = (pdf_index, file_stat)
+            if len(pending) >= MAX_PENDING_PDFS:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        collect(list(pending))
+
+    if connection:
+        store_cached_results(connection, pending_rows)
+        connection.close()
+        print(f"Reused cached results for {cached_count} of {len(pdf_paths)} reports.")
+    if filter_phrases:
+        print(f"Found {filtered_count} reports matching filter.")
+
+    # Renumber the PDFs in sorted path order so every per-term list is reported in sorted order
+    order = sorted(range(len(pdf_paths)), key=pdf_paths.__getitem__)
+    rank = array('I', bytes(4 * len(pdf_paths)))
+    for new_index, old_index in enumerate(order):
+        rank[old_index] = new_index
+    target_pdfs = [pdf_paths[old_index] for old_index in order]
+    match_indexes = {term: array('I', sorted(rank[i] for i in indexes)) for term, indexes in match_indexes.items()}
+
+    # Calculate total unique files based on the collected indexes across all terms
+    total_unique_files_overall = set().union(*match_indexes.values())
+
+    return target_pdfs, match_indexes, len(total_unique_files_overall)
+
+def load_or_build_index(index_filename, folders, recursive=True):
+    """
+    Returns the PDF paths for the given folders, reusing the index file if it was built for the same folders.
+    The first line of the index file records the folders it was built from.
+    """
+    index_header = INDEX_FOLDER_SEPARATOR.join(folders)
+    if os.path.exists(index_filename):
+        print(f"Checking existing index '{index_filename}'...")
+        try:
+            with open(index_filename, 'r', encoding='utf-8') as f:
+                first_line = f.readline().strip()
+                if first_line == index_header:
+                    all_pdf_paths = [line.strip() for line in f if line.strip()]
+                    if all_pdf_paths:
+                        print(f"Loaded {len(all_pdf_paths)} paths from index.")
+                        return all_pdf_paths
+                    print("Index file is empty. Re-indexing.")
+                else:
+                    print(f"Index file folders ('{first_line}') do not match target folders ('{index_header}'). Re-indexing.")
+        except Exception as e:
+            print(f"Error reading index file '{index_filename}': {e}. Re-indexing.")
+
+    print("Indexing PDF files (this may take a few minutes)...")
+    all_pdf_paths = list(tqdm(stream_pdfs(folders, recursive), desc="Indexing PDF files"))
+    if all_pdf_paths:
+        try:
+            with open(index_filename, 'w', encoding='utf-8') as f:
+                f.write(index_header + '\n')
+                for path in all_pdf_paths:
+                    f.write(path + '\n')
+            print(f"Index file '{index_filename}' created/updated successfully with {len(all_pdf_paths)} paths.")
+        except Exception as e:
+            print(f"Error: Could not write index file '{index_filename}': {e}")
+    return all_pdf_paths
+
+def load_custom_index(custom_index_path):
+    """Reads a list of PDF paths (one per line) from a user-supplied file, exiting on error."""
+    if not os.path.exists(custom_index_path):
+        print(f"Error: Custom index file not found: {custom_index_path}")
+        sys.exit(1)
+    try:
+        with open(custom_index_path, 'r', encoding='utf-8') as f:
+            all_pdf_paths = [line.strip() for line in f if line.strip()]
+    except Exception as e:
+        print(f"Error reading custom index file '{custom_index_path}': {e}")
+        sys.exit(1)
+    print(f"Loaded {len(all_pdf_paths)} paths from custom index.")
+    return all_pdf_paths
+
+def write_report(output_filename, pdf_paths, match_indexes, total_unique_count, source_description, filter_phrases=None):
+    """Streams the search report straight to the output file, mapping match indexes back to pdf_paths."""
+    try:
+        with open(output_filename, 'w', encoding='utf-8') as f:
+            def emit(line):
+                f.write(line)
+                f.write("\n")
+
+            emit("--- Search Results (Sentence-Level Analysis) ---")
+            emit(f"\nSource: {source_description}")
+            emit(f"\n{'='*55}")
+            if filter_phrases:
+                emit(f"## Results for reports filtered by any of: {filter_phrases}")
+            else:
+                emit("## Results for all scanned reports")
+            emit(f"{'='*55}")
+            emit("### Individual Term Counts:")
+
+            for term, indexes in sorted(match_indexes.items()): # Sort terms alphabetically in report
+                emit(f"  - {term:<25}: {len(indexes)} reports")
+
+            emit(f"\n### Total Unique Reports in this Category: {total_unique_count}")
+            emit("--- File List ---")
+
+            for term in sorted(match_indexes):
+                # Indexes were appended in order of the sorted pdf_paths, so no per-term sort is needed
+                indexes = match_indexes[term]
+                if indexes:
+                    emit(f"\n#### Files containing '{term}':")
+                    for index in indexes:
+                        emit(f"- {pdf_paths[index]}")
+
+            emit("\n--- End of Report ---")
+        print(f"\nAnalysis complete. Report successfully saved to: {os.path.abspath(output_filename)}")
+    except Exception as e:
+        print(f"\nError: Could not write report to file '{output_filename}'. {e}")
+
+def run(folders, search_terms, output_file, recursive=True, negative_keywords=NEGATIVE_KEYWORDS,
+        filter_phrases=None, index_file=None, pdf_paths=None, sentence_splitter="regex", source_description=None,
+        scan_cache_file=SCAN_CACHE_FILE):
+    """
+    Runs a full search: discovers PDFs, analyzes them and writes the report.
+    PDFs come from pdf_paths if given, otherwise from the index file (when set) or a fresh scan of the folders.
+    """
+    if pdf_paths is not None:
+        all_pdf_paths = pdf_paths
+    elif index_file:
+        all_pdf_paths = load_or_build_index(index_file, folders, recursive)
+    else:
+        # Streamed straight into the analysis, so the workers start on the first PDF the walk finds
+        all_pdf_paths = stream_pdfs(folders, recursive)
+
+    if source_description is None:
+        source_description = f"folders {folders}" + (f" (using index '{index_file}')" if index_file else "")
+
+    if isinstance(all_pdf_paths, list):
+        if not all_pdf_paths:
+            print("No PDF file paths available to process. Exiting.")
+            return
+        print(f"Proceeding with analysis on {len(all_pdf_paths)} PDF files from {source_description}.\n")
+    else:
+        print(f"Discovering and analyzing PDF files from {source_description}...\n")
+
+    # Ensure all search terms are lowercase for consistent matching
+    search_terms = [term.lower() for term in search_terms]
+
+    target_pdfs, match_indexes, total_unique_count = find_and_process_pdfs(
+        all_pdf_paths,
+        search_terms,
+        negative_keywords=negative_keywords,
+        filter_phrases=filter_phrases,
+        split_sentences=get_sentence_splitter(sentence_splitter),
+        scan_cache_file=scan_cache_file
+    )
+    if not target_pdfs:
+        print("No PDF file paths available to process. Exiting.")
+        return
+    write_report(output_file, target_pdfs, match_indexes, total_unique_count, source_description, filter_phrases)
+
+def main(argv=None, folders=(), search_terms=SEARCH_TERMS, output_file=OUTPUT_FILE, recursive=True,
+         index_file=None, negative_keywords=NEGATIVE_KEYWORDS, sentence_splitter="regex"):
+    """Parses command-line arguments, using the caller's settings as defaults, and runs the search."""
+    parser = argparse.ArgumentParser(description="Scan PDF reports for specific medical terms using sentence-level analysis.")
+    parser.add_argument('--folders', '--folder', type=str, nargs='+', default=list(folders), metavar='FOLDER', help=f'Folders to scan for PDF reports (default: {list(folders)}).')
+    parser.add_argument('--terms', type=str, nargs='+', default=list(search_terms), metavar='"TERM"', help='Search terms to look for (default: the configured list).')
+    parser.add_argument('-o', '--output', type=str, default=output_file, help=f'Specify the output report file name (default: {output_file}).')
+    parser.add_argument('--recursive', dest='recursive', action='store_true', default=recursive, help=f'Also search subfolders of the given folders (default: {recursive}).')
+    parser.add_argument('--no-recursive', dest='recursive', action='store_false', help='Search only the given folders, not their subfolders.')
+    parser.add_argument('-i', '--index', type=str, default=index_file, help=f'PDF index file used to skip re-scanning the folders (default: {index_file}).')
+    parser.add_argument('--use-custom-index', type=str, metavar='FILEPATH', help='Specify a text file containing a list of PDF paths (one per line) to process instead of scanning folders.')
+    parser.add_argument('--scan', '--filter', dest='filter', type=str, nargs='+', metavar='"PHRASE"', help='Scan only reports containing any of the given phrases in the filename or content (e.g., "hrct chest" "cect thorax").')
+    parser.add_argument('--scan-all', action='store_true', help='Scan all reports without filtering (the default when --scan is not given).')
+    parser.add_argument('--no-scan-cache', action='store_true', help=f"Re-analyze every report instead of reusing unchanged results from '{SCAN_CACHE_FILE}'.")
+
+    args = parser.parse_args(argv)
+
+    if args.use_custom_index:
+        print(f"Using custom index file: {args.use_custom_index}")
+        pdf_paths = load_custom_index(args.use_custom_index)
+        source_description = f"custom index file '{args.use_custom_index}'"
+    else:
+        if not args.folders:
+            parser.error("No folders to scan. Use --folders or --use-custom-index.")
+        pdf_paths = None
+        source_description = None
+
+    run(
+        args.folders,
+        args.terms,
+        args.output,
+        recursive=args.recursive,
+        negative_keywords=negative_keywords,
+        filter_phrases=args.filter,
+        index_file=args.index,
+        pdf_paths=pdf_paths,
+        sentence_splitter=sentence_splitter,
+        source_description=source_description,
+        scan_cache_file=None if args.no_scan_cache else SCAN_CACHE_FILE
+    )
+
+# Standard Python entry point check
+if __name__ == "__main__":
+    main()
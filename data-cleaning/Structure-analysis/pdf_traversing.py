@@ -1,6 +1,9 @@
 import os
 import fitz  # PyMuPDF
 import time
+import logging
+import logging.handlers
+from tqdm import tqdm
 
 # --- CONFIGURATION ---
 # IMPORTANT: Update these paths to your actual folder locations
@@ -13,27 +16,37 @@ PHRASE_CT = "CT abdomen"
 PHRASE_VENOUS = "venous phase"
 
 OUTPUT_FILE = "output.txt"
+SCAN_LOG_FILE = "scan.log"
 # --- END CONFIGURATION ---
 
+# Per-file scan events go to a log file instead of the console
+scan_logger = logging.getLogger("scan")
+scan_logger.setLevel(logging.DEBUG)
+scan_logger.propagate = False
+
 def analyze_pdf(pdf_path):
     """
     Analyzes a PDF for different phrase combinations.
     Returns a category and relevant data based on what is found.
     """
     try:
-        full_text = ""
+        has_ct = False
+        has_venous = False
         with fitz.open(pdf_path) as doc:
             for page in doc:
-                full_text += page.get_text("text")
+                # search_for runs inside PyMuPDF; share one text page across the phrase lookups
+                textpage = page.get_textpage()
 
-        # Priority 1: Check for the full sentence
-        if SENTENCE_PHRASE in full_text:
-            return "sentence", None # Stop if the highest priority match is found
+                # Priority 1: Check for the full sentence
+                if page.search_for(SENTENCE_PHRASE, textpage=textpage):
+                    return "sentence", None # Stop if the highest priority match is found
 
-        # Priority 2: Check for both individual phrases
-        has_ct = PHRASE_CT in full_text
-        has_venous = PHRASE_VENOUS in full_text
+                if not has_ct:
+                    has_ct = bool(page.search_for(PHRASE_CT, textpage=textpage))
+                if not has_venous:
+                    has_venous = bool(page.search_for(PHRASE_VENOUS, textpage=textpage))
 
+        # Priority 2: Check for both individual phrases
         if has_ct and has_venous:
             return "both", None # Stop if the second priority match is found
 
@@ -48,7 +61,7 @@ def analyze_pdf(pdf_path):
             return "individual", individual_matches
 
     except Exception as e:
-        print(f"-> ERROR: Could not process file '{os.path.basename(pdf_path)}'. Reason: {e}")
+        tqdm.write(f"-> ERROR: Could not process file '{os.path.basename(pdf_path)}'. Reason: {e}")
         return "error", None
 
     return "none", None
@@ -85,29 +98,39 @@ def main():
         
     total_files = len(all_pdfs)
     print(f"\nFound a total of {total_files} PDF(s) to scan.")
-    print("--- Starting Detailed Scan ---")
+    print(f"--- Starting Detailed Scan (per-file details in '{SCAN_LOG_FILE}') ---")
 
-    # Step 2: Analyze each PDF with detailed logging
-    for i, pdf_path in enumerate(all_pdfs, 1):
-        print(f"[{i}/{total_files}] Scanning: {pdf_path}")
-        
-        category, data = analyze_pdf(pdf_path)
+    file_handler = logging.FileHandler(SCAN_LOG_FILE, mode='w', encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(message)s'))
+    # Buffer records in memory and write them out in batches
+    buffered_handler = logging.handlers.MemoryHandler(1000, flushLevel=logging.CRITICAL, target=file_handler)
+    scan_logger.addHandler(buffered_handler)
+
+    try:
+        # Step 2: Analyze each PDF, logging per-file status to the scan log
+        for pdf_path in tqdm(all_pdfs, desc="Scanning PDFs", unit="pdf"):
+            category, data = analyze_pdf(pdf_path)
         
-        if category == "sentence":
-            print(f"-> STATUS: FOUND full sentence.")
-            matches["sentence"].append(pdf_path)
-        elif category == "both":
-            print(f"-> STATUS: FOUND both '{PHRASE_CT}' and '{PHRASE_VENOUS}'.")
-            matches["both"].append(pdf_path)
-        elif category == "individual":
-            log_msg = "-> STATUS: Found individual phrase(s): " + ", ".join(data)
-            print(log_msg)
-            if "ct_abdomen" in data:
-                matches["ct_abdomen"].append(pdf_path)
-            if "venous_phase" in data:
-                matches["venous_phase"].append(pdf_path)
-        elif category == "none":
-            print("-> STATUS: No target phrases found.")
+            if category == "sentence":
+                scan_logger.debug(f"{pdf_path} -> STATUS: FOUND full sentence.")
+                matches["sentence"].append(pdf_path)
+            elif category == "both":
+                scan_logger.debug(f"{pdf_path} -> STATUS: FOUND both '{PHRASE_CT}' and '{PHRASE_VENOUS}'.")
+                matches["both"].append(pdf_path)
+            elif category == "individual":
+                scan_logger.debug(f"{pdf_path} -> STATUS: Found individual phrase(s): " + ", ".join(data))
+                if "ct_abdomen" in data:
+                    matches["ct_abdomen"].append(pdf_path)
+                if "venous_phase" in data:
+                    matches["venous_phase"].append(pdf_path)
+            elif category == "none":
+                scan_logger.debug(f"{pdf_path} -> STATUS: No target phrases found.")
+    finally:
+        # Write out whatever is still buffered, even if the scan was interrupted
+        buffered_handler.flush()
+        scan_logger.removeHandler(buffered_handler)
+        buffered_handler.close()
+        file_handler.close()
             
     # Step 3: Save the results to the output file
     print(f"\n--- Scan Complete ---")
@@ -1,21 +1,33 @@
 import os
 import shutil
-import configparser
+import functools
+import posixpath
 import zipfile
-from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 CONFIG_FILE = 'config.ini'
+# Zip checks and folder deletion mostly wait on the disk, so several folders are cleaned at once
+MAX_WORKERS = 8
 
 def load_config():
-    """Loads directory paths from the config.ini file."""
-    config = configparser.ConfigParser()
+    """Loads directory paths from the [paths] section of the config.ini file."""
     if not os.path.exists(CONFIG_FILE):
         raise FileNotFoundError(f"Error: Configuration file '{CONFIG_FILE}' not found.")
-    config.read(CONFIG_FILE)
+    # Only two keys are needed, so a small line parser stands in for configparser
+    paths = {}
+    section = None
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(('#', ';')):
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                section = line[1:-1].strip()
+            elif section == 'paths' and '=' in line:
+                key, value = line.split('=', 1)
+                paths[key.strip().lower()] = value.strip()
     try:
-        files_dir = config['paths']['files_directory']
-        zips_dir = config['paths']['zips_directory']
-        return files_dir, zips_dir
+        return paths['files_directory'], paths['zips_directory']
     except KeyError:
         raise KeyError("Error: Make sure 'files_directory' and 'zips_directory' are set in config.ini")
 
@@ -26,15 +38,16 @@ def get_patient_folders(files_dir):
         print(f"Warning: Files directory not found at '{files_dir}'")
         return []
     
+    # scandir reports the entry type from the directory listing, avoiding an isdir() call per entry
     # Go through each item in the files_dir (e.g., '20250101', '20250102')
-    for date_folder in os.listdir(files_dir):
-        date_folder_path = os.path.join(files_dir, date_folder)
-        if os.path.isdir(date_folder_path):
-            # Go through each item in the date_folder (e.g., 'BABLU_...', 'ASHA_YADAV_...')
-            for patient_folder in os.listdir(date_folder_path):
-                patient_folder_path = os.path.join(date_folder_path, patient_folder)
-                if os.path.isdir(patient_folder_path):
-                    patient_folders.append(patient_folder_path)
+    with os.scandir(files_dir) as date_entries:
+        for date_entry in date_entries:
+            if date_entry.is_dir():
+                # Go through each item in the date_folder (e.g., 'BABLU_...', 'ASHA_YADAV_...')
+                with os.scandir(date_entry.path) as patient_entries:
+                    for patient_entry in patient_entries:
+                        if patient_entry.is_dir():
+                            patient_folders.append(patient_entry.path)
     return patient_folders
 
 def get_zip_basenames(zips_dir):
@@ -43,17 +56,42 @@ def get_zip_basenames(zips_dir):
         print(f"Warning: Zips directory not found at '{zips_dir}'")
         return set()
     
-    return {os.path.splitext(f)[0] for f in os.listdir(zips_dir) if f.lower().endswith('.zip')}
+    with os.scandir(zips_dir) as entries:
+        return {os.path.splitext(entry.name)[0] for entry in entries if entry.name.lower().endswith('.zip')}
 
-def check_zip_content(zip_path, pdf_filename):
-    """Safety Check: Verifies if the PDF exists inside the zip archive."""
+@functools.lru_cache(maxsize=None)
+def zip_basenames(zip_path):
+    """Returns the file names stored in a zip archive, or an empty set if it cannot be read."""
     try:
         with zipfile.ZipFile(zip_path, 'r') as zf:
             # zipfile stores paths with forward slashes, even on Windows
-            pdf_in_zip = any(entry.endswith(pdf_filename) for entry in zf.namelist())
-            return pdf_in_zip
+            return frozenset(posixpath.basename(name) for name in zf.namelist())
     except (zipfile.BadZipFile, FileNotFoundError):
-        return False
+        return frozenset()
+
+def clean_folder(folder_path, zips_dir):
+    """
+    Deletes one patient folder if its PDF is confirmed to be inside the matching zip.
+    Returns (status, folder_basename, error) where status is 'deleted' or 'skipped'.
+    """
+    folder_basename = os.path.basename(folder_path)
+
+    # Safety Check 1: Find a PDF in the source folder
+    pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
+    if not pdf_files:
+        return 'skipped', folder_basename, None
+    
+    pdf_filename = pdf_files[0]
+    zip_path = os.path.join(zips_dir, folder_basename + '.zip')
+
+    # Safety Check 2: Verify the PDF is inside the zip file
+    if pdf_filename not in zip_basenames(zip_path):
+        return 'skipped', folder_basename, None
+    try:
+        shutil.rmtree(folder_path)
+    except OSError as e:
+        return 'skipped', folder_basename, f"Error deleting folder {folder_path}: {e}"
+    return 'deleted', folder_basename, None
 
 def main():
     """Main function to run the cleanup process."""
@@ -108,36 +146,23 @@ def main():
         return
 
     # --- 3. Delete the folders with safety checks ---
+    from tqdm import tqdm # Imported here so dry runs and cancellations skip loading it
     print("\nStarting deletion process with safety checks...")
     deleted_count = 0
     skipped_count = 0
     
-    with tqdm(folders_to_delete, desc="Cleaning folders", unit="folder") as pbar:
-        for folder_path in pbar:
-            folder_basename = os.path.basename(folder_path)
-            pbar.set_postfix_str(folder_basename)
-
-            # Safety Check 1: Find a PDF in the source folder
-            pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
-            if not pdf_files:
-                # print(f"  [SKIPPED] No PDF found in '{folder_basename}'.")
-                skipped_count += 1
-                continue
-            
-            pdf_filename = pdf_files[0]
-            zip_path = os.path.join(zips_dir, folder_basename + '.zip')
-
-            # Safety Check 2: Verify the PDF is inside the zip file
-            if check_zip_content(zip_path, pdf_filename):
-                try:
-                    shutil.rmtree(folder_path)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(clean_folder, folder_path, zips_dir) for folder_path in folders_to_delete]
+        with tqdm(as_completed(futures), total=len(futures), desc="Cleaning folders", unit="folder") as pbar:
+            for future in pbar:
+                status, folder_basename, error = future.result()
+                pbar.set_postfix_str(folder_basename)
+                if error:
+                    tqdm.write(f"\n{error}")
+                if status == 'deleted':
                     deleted_count += 1
-                except OSError as e:
-                    print(f"\nError deleting folder {folder_path}: {e}")
+                else:
                     skipped_count += 1
-            else:
-                # print(f"  [SKIPPED] PDF '{pdf_filename}' not found in the corresponding zip. Folder kept for safety.")
-                skipped_count += 1
     
     print("\n--- Cleanup Complete ---")
     print(f"Successfully deleted: {deleted_count} folders.")
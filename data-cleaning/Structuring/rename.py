@@ -62,20 +62,37 @@ def rename_all_zips_in_sequence():
         # 5. Execute the renaming process
         print("\nRenaming files...")
         renamed_count = 0
-        # We rename in reverse to avoid conflicts where a new name might overwrite an existing old name
-        for old_name, new_name, old_path, new_path in reversed(rename_plan):
-            try:
-                # To prevent errors (e.g., renaming A.zip to B.zip when B.zip already exists),
-                # we first rename to a temporary name, then to the final name.
-                temp_name = f"{new_name}.tmp"
-                temp_path = os.path.join(folder_path, temp_name)
-                
-                os.rename(old_path, temp_path)
-                os.rename(temp_path, new_path)
-                
+        # Files whose new name is free are renamed in one step. A file whose new name is still taken
+        # (e.g. by another file that has not moved yet) is parked in a staging folder first.
+        existing_names = set(all_items)
+        staging_dir = os.path.join(folder_path, '.rename_staging')
+        staged = []
+        for old_name, new_name, old_path, new_path in rename_plan:
+            if old_name == new_name:
                 renamed_count += 1
+                continue
+            try:
+                if new_name in existing_names:
+                    os.makedirs(staging_dir, exist_ok=True)
+                    os.rename(old_path, os.path.join(staging_dir, new_name))
+                    staged.append((old_name, new_name, new_path))
+                else:
+                    os.rename(old_path, new_path)
+                    existing_names.add(new_name)
+                    renamed_count += 1
+                existing_names.discard(old_name)
             except Exception as e:
                 print(f"Could not rename '{old_name}'. Error: {e}")
+
+        # Every old name has been vacated now, so staged files can take their final names
+        for old_name, new_name, new_path in staged:
+            try:
+                os.rename(os.path.join(staging_dir, new_name), new_path)
+                renamed_count += 1
+            except Exception as e:
+                print(f"Could not rename '{old_name}' (left as '{new_name}' in {staging_dir}). Error: {e}")
+        if staged and not os.listdir(staging_dir):
+            os.rmdir(staging_dir)
         
         print(f"\n✅ Process complete. {renamed_count} files were successfully renamed.")
 
@@ -1,8 +1,13 @@
+import mmap
 import os
 import pydicom
 import re
-from collections import defaultdict
+import threading
+from io import BytesIO
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 
 # --- 1. SET THE BASE FOLDER CONTAINING ALL PATIENT FOLDERS ---
 # This is the top-level directory.
@@ -12,6 +17,27 @@ base_folder = r"E:\InnoWave_Data\filestore"
 # --- 2. CONFIGURE LOG FILE ---
 # A log file will be created in the same directory where the script is run.
 log_filename = f"dicom_analysis_log_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.txt"
+# Reports are written line by line; a large buffer turns them into few disk writes
+LOG_BUFFER_BYTES = 1 << 20
+
+# Header reads are mostly waiting on disk, so each folder worker keeps this many in flight.
+# On network filestores (NFS/SMB), where every open and read pays a round trip,
+# raising this (e.g. to 64-128) keeps more requests outstanding per folder
+HEADER_READ_THREADS = 16
+
+# The only DICOM tags the analysis reads; dcmread skips parsing every other element
+DICOM_TAGS = ['PatientID', 'StudyDate', 'BodyPartExamined', 'StudyDescription', 'SeriesDescription']
+
+# Headers are fetched with a single read of this many bytes; files whose header
+# runs past it (no Pixel Data tag inside the prefix) are re-read from the path
+HEADER_PREFIX_BYTES = 64 * 1024
+# (7FE0,0010) Pixel Data tag as it appears in little-endian files
+PIXEL_DATA_TAG = b'\xe0\x7f\x10\x00'
+
+# --- 3. QUICK TRIAGE (OPTIONAL) ---
+# Stop scanning a folder once this many different Patient IDs have been seen;
+# its report then shows partial counts. None scans every file.
+EARLY_EXIT_PATIENTS = None
 
 
 def find_body_part(dicom_dataset):
@@ -30,94 +56,170 @@ def find_body_part(dicom_dataset):
     return "Unknown"
 
 
-def analyze_patient_folder(folder_path):
+# Each header-reading thread reuses one prefix buffer instead of allocating a new one per file
+_thread_state = threading.local()
+
+def _header_buffer():
+    """Returns this thread's HEADER_PREFIX_BYTES read buffer."""
+    buffer = getattr(_thread_state, 'buffer', None)
+    if buffer is None:
+        buffer = _thread_state.buffer = bytearray(HEADER_PREFIX_BYTES)
+    return buffer
+
+
+def read_dicom_header(full_path):
     """
-    Analyzes a single patient folder and returns a formatted string report.
+    Reads the DICOM header of a file, using one read call for the common case
+    where the whole header sits inside the first HEADER_PREFIX_BYTES.
     """
-    report_lines = []
-    report_lines.append(f"--- Analysis for Folder: {os.path.basename(folder_path)} ---")
+    buffer = _header_buffer()
+    with open(full_path, 'rb', buffering=0) as f:
+        size = f.readinto(buffer)
+        if size < HEADER_PREFIX_BYTES or buffer.find(PIXEL_DATA_TAG, 0, size) != -1:
+            return pydicom.dcmread(BytesIO(memoryview(buffer)[:size]), stop_before_pixels=True, specific_tags=DICOM_TAGS)
+
+        # Longer headers are parsed from a memory map of the file, so pydicom's many
+        # small reads are served from the page cache instead of one syscall each
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return pydicom.dcmread(mapped, stop_before_pixels=True, specific_tags=DICOM_TAGS)
+
+
+def _read_header(full_path):
+    """
+    Reads one DICOM header and returns (patient_id, body_part, study_date),
+    or None if the file could not be read.
+    """
+    try:
+        ds = read_dicom_header(full_path)
+
+        # Use PatientID as the primary identifier for consistency
+        patient_id = ds.get('PatientID', 'Unknown_Patient_ID').strip()
+        body_part = find_body_part(ds)
+        study_date = ds.get('StudyDate', 'Unknown_Date').strip() # ADDED: Get Study Date
+        return patient_id, body_part, study_date
+
+    except Exception as e:
+        # Catch any error during DICOM reading; the caller counts it
+        # This detailed error won't go to the log, but is useful for debugging
+        # print(f"DEBUG: Error reading {full_path}. Reason: {e}")
+        return None
+
+
+def list_dicom_files(folder_path):
+    """
+    Returns the paths of all .dcm files under a folder, including subfolders.
+    Unreadable subfolders are skipped, as os.walk does.
+    """
+    dicom_paths = []
+    pending_dirs = [folder_path]
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        try:
+            # scandir reports the entry type from the directory listing, avoiding a stat per entry
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                    elif entry.name[-4:].lower() == '.dcm':  # lowercases only the extension, not the whole name
+                        dicom_paths.append(entry.path)
+        except OSError:
+            continue
+    return dicom_paths
+
 
+def analyze_patient_folder(folder_path, early_exit=None):
+    """
+    Reads the DICOM headers of a single patient folder, stopping once early_exit
+    different Patient IDs have been seen (if given).
+    Returns (files_scanned, error_files, patient_counts, study_date_counts, body_part_counts, stopped_early);
+    runs in a worker process, so only these counts travel back to the main process.
+    """
     # Data structures for this specific folder's analysis
-    unique_patients = set()
-    unique_body_parts = set()
-    unique_study_dates = set()  # ADDED: For tracking unique dates
-    patient_counts = defaultdict(int)
-    body_part_counts = defaultdict(int)
-    study_date_counts = defaultdict(int) # ADDED: For counting date occurrences
-    files_scanned = 0
+    # Each Counter's keys double as the set of unique values
+    patient_counts = Counter()
+    body_part_counts = Counter()
+    study_date_counts = Counter() # ADDED: For counting date occurrences
     error_files = 0
 
-    # Walk through the specific patient folder
-    for root, dirs, files in os.walk(folder_path):
-        for filename in files:
-            if not filename.lower().endswith('.dcm'):
-                continue
+    files_scanned = 0
+    stopped_early = False
 
+    # Collect the DICOM files first so their headers can be read concurrently
+    dicom_paths = list_dicom_files(folder_path)
+
+    # Counters are only updated here, as the thread results come back in order
+    with ThreadPoolExecutor(max_workers=HEADER_READ_THREADS) as executor:
+        futures = [executor.submit(_read_header, dicom_path) for dicom_path in dicom_paths]
+        for future in futures:
+            header = future.result()
             files_scanned += 1
-            full_path = os.path.join(root, filename)
-            
-            try:
-                # Use stop_before_pixels for speed, as we only need the header
-                ds = pydicom.dcmread(full_path, stop_before_pixels=True)
+            if header is None:
+                error_files += 1
+                continue
 
-                # Use PatientID as the primary identifier for consistency
-                patient_id = ds.get('PatientID', 'Unknown_Patient_ID').strip()
-                body_part = find_body_part(ds)
-                study_date = ds.get('StudyDate', 'Unknown_Date').strip() # ADDED: Get Study Date
+            patient_id, body_part, study_date = header
+            patient_counts[patient_id] += 1
+            body_part_counts[body_part] += 1
+            study_date_counts[study_date] += 1 # ADDED: Increment date count
 
-                unique_patients.add(patient_id)
-                unique_body_parts.add(body_part)
-                unique_study_dates.add(study_date) # ADDED: Add date to set
-                patient_counts[patient_id] += 1
-                body_part_counts[body_part] += 1
-                study_date_counts[study_date] += 1 # ADDED: Increment date count
+            if early_exit and len(patient_counts) >= early_exit and files_scanned < len(dicom_paths):
+                # Drop the header reads that have not started yet
+                stopped_early = True
+                for pending in futures[files_scanned:]:
+                    pending.cancel()
+                executor.shutdown(wait=False)
+                break
 
-            except Exception as e:
-                # Catch any error during DICOM reading and log it
-                error_files += 1
-                # This detailed error won't go to the log, but is useful for debugging
-                # print(f"DEBUG: Error reading {full_path}. Reason: {e}")
+    return files_scanned, error_files, patient_counts, study_date_counts, body_part_counts, stopped_early
+
+
+def write_folder_report(out, folder_path, analysis):
+    """
+    Writes the report for one patient folder line by line to an open text file.
+    """
+    files_scanned, error_files, patient_counts, study_date_counts, body_part_counts, stopped_early = analysis
+    out.write(f"--- Analysis for Folder: {os.path.basename(folder_path)} ---\n")
 
-    # --- Build the report string ---
     if files_scanned == 0:
-        report_lines.append("No DICOM (.dcm) files were found in this folder.")
-        return "\n".join(report_lines)
+        out.write("No DICOM (.dcm) files were found in this folder.\n")
+        return
 
-    report_lines.append(f"\nTotal DICOM files scanned: {files_scanned}")
+    out.write(f"\nTotal DICOM files scanned: {files_scanned}\n")
     if error_files > 0:
-        report_lines.append(f"Files that could not be read: {error_files}")
+        out.write(f"Files that could not be read: {error_files}\n")
 
     # Patient Consistency Report
-    report_lines.append("\n--- Patient Consistency Report ---")
-    if len(unique_patients) == 1:
-        report_lines.append(f"✅ Consistent: All {files_scanned - error_files} readable files belong to the same patient.")
-        report_lines.append(f"   - Patient ID: {list(unique_patients)[0]}")
+    out.write("\n--- Patient Consistency Report ---\n")
+    if len(patient_counts) == 1:
+        out.write(f"✅ Consistent: All {files_scanned - error_files} readable files belong to the same patient.\n")
+        out.write(f"   - Patient ID: {next(iter(patient_counts))}\n")
     else:
-        report_lines.append(f"⚠️ Inconsistent: Found {len(unique_patients)} different patients.")
+        out.write(f"⚠️ Inconsistent: Found {len(patient_counts)} different patients.\n")
         for patient, count in patient_counts.items():
-            report_lines.append(f"   - Patient ID: {patient} (found in {count} files)")
+            out.write(f"   - Patient ID: {patient} (found in {count} files)\n")
 
     # Study Date Consistency Report (NEW SECTION)
-    report_lines.append("\n--- Study Date Consistency Report ---")
-    if len(unique_study_dates) == 1:
-        report_lines.append(f"✅ Consistent: All {files_scanned - error_files} readable files share the same study date.")
-        report_lines.append(f"   - Study Date: {list(unique_study_dates)[0]}")
+    out.write("\n--- Study Date Consistency Report ---\n")
+    if len(study_date_counts) == 1:
+        out.write(f"✅ Consistent: All {files_scanned - error_files} readable files share the same study date.\n")
+        out.write(f"   - Study Date: {next(iter(study_date_counts))}\n")
     else:
-        report_lines.append(f"⚠️ Inconsistent: Found {len(unique_study_dates)} different study dates.")
+        out.write(f"⚠️ Inconsistent: Found {len(study_date_counts)} different study dates.\n")
         for date, count in study_date_counts.items():
-            report_lines.append(f"   - Study Date: {date} (found in {count} files)")
+            out.write(f"   - Study Date: {date} (found in {count} files)\n")
 
     # Body Part Consistency Report
-    report_lines.append("\n--- Body Part Consistency Report ---")
-    if len(unique_body_parts) == 1:
-        report_lines.append(f"✅ Consistent: All {files_scanned - error_files} readable files appear to be for the same body part.")
-        report_lines.append(f"   - Body Part: {list(unique_body_parts)[0]}")
+    out.write("\n--- Body Part Consistency Report ---\n")
+    if len(body_part_counts) == 1:
+        out.write(f"✅ Consistent: All {files_scanned - error_files} readable files appear to be for the same body part.\n")
+        out.write(f"   - Body Part: {next(iter(body_part_counts))}\n")
     else:
-        report_lines.append(f"⚠️ Inconsistent: Found {len(unique_body_parts)} different body parts.")
+        out.write(f"⚠️ Inconsistent: Found {len(body_part_counts)} different body parts.\n")
         for part, count in body_part_counts.items():
-            report_lines.append(f"   - Body Part: '{part}' (found in {count} files)")
-    
-    return "\n".join(report_lines)
+            out.write(f"   - Body Part: '{part}' (found in {count} files)\n")
+
+    if stopped_early:
+        out.write(f"\n(scan terminated early after finding {len(patient_counts)} different patients; counts are partial)\n")
 
 
 # --- MAIN EXECUTION ---
@@ -129,7 +231,7 @@ if __name__ == "__main__":
         print(f"Starting analysis. Results will be saved to '{log_filename}'")
         
         # Open the log file to write the reports
-        with open(log_filename, 'w') as log_file:
+        with open(log_filename, 'w', encoding='utf-8', buffering=LOG_BUFFER_BYTES) as log_file:
             log_file.write(f"DICOM Consistency Analysis Report\n")
             log_file.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             log_file.write(f"Base Folder Analyzed: {base_folder}\n")
@@ -137,16 +239,20 @@ if __name__ == "__main__":
 
             # Get the list of patient folders directly inside the base folder
             try:
-                patient_folders = [os.path.join(base_folder, d) for d in os.listdir(base_folder) if os.path.isdir(os.path.join(base_folder, d))]
+                with os.scandir(base_folder) as entries:
+                    patient_folders = [entry.path for entry in entries if entry.is_dir()]
                 
                 if not patient_folders:
                     print("No patient subfolders found in the base folder.")
                     log_file.write("No patient subfolders found in the base folder.")
                 else:
-                    for folder_path in patient_folders:
-                        print(f"Analyzing folder: {os.path.basename(folder_path)}...")
-                        report = analyze_patient_folder(folder_path)
-                        log_file.write(report + "\n\n" + "-"*80 + "\n\n")
+                    # Folders are analyzed in worker processes; map() yields the results in folder order
+                    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                        analyses = executor.map(partial(analyze_patient_folder, early_exit=EARLY_EXIT_PATIENTS), patient_folders)
+                        for folder_path, analysis in zip(patient_folders, analyses):
+                            print(f"Analyzed folder: {os.path.basename(folder_path)}")
+                            write_folder_report(log_file, folder_path, analysis)
+                            log_file.write("\n" + "-"*80 + "\n\n")
                     
                     print(f"\nAnalysis complete. Log file '{log_filename}' has been created.")
 
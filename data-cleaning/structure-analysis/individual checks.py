@@ -1,11 +1,14 @@
 import os
 import pydicom
-from collections import defaultdict
+from collections import Counter
 import re
 
 # --- 1. SET THE FOLDER YOU WANT TO ANALYZE HERE ---
 main_folder = r"C:\Users\dedse\Downloads\1.3.12.2.1107.5.1.7.137168.30000025081110302351200000019"
 
+# The only DICOM tags the analysis reads; dcmread skips parsing every other element
+DICOM_TAGS = ['PatientName', 'StudyDate', 'BodyPartExamined', 'StudyDescription', 'SeriesDescription']
+
 def find_body_part(dicom_dataset):
     """Attempts to find the body part from multiple common DICOM tags."""
     tags_to_check = ['BodyPartExamined', 'StudyDescription', 'SeriesDescription']
@@ -23,28 +26,24 @@ def clean_for_filename(text_to_clean):
 # --- Main Analysis Logic ---
 print(f"--- Starting Analysis in: {main_folder} ---\n")
 
-# Data structures to hold unique values and their counts
-unique_names = set()
-unique_dates = set()
-unique_body_parts = set()
-
-name_counts = defaultdict(int)
-date_counts = defaultdict(int)
-body_part_counts = defaultdict(int)
+# Counters of each value; their keys double as the set of unique values
+name_counts = Counter()
+date_counts = Counter()
+body_part_counts = Counter()
 
 files_scanned = 0
 error_files = 0
 
 for root, dirs, files in os.walk(main_folder):
     for filename in files:
-        if not filename.lower().endswith('.dcm'):
+        if filename[-4:].lower() != '.dcm':  # lowercases only the extension, not the whole name
             continue
         
         files_scanned += 1
         full_path = os.path.join(root, filename)
         
         try:
-            ds = pydicom.dcmread(full_path, stop_before_pixels=True)
+            ds = pydicom.dcmread(full_path, stop_before_pixels=True, specific_tags=DICOM_TAGS)
 
             # --- Extract all required data ---
             # For names, convert the special PersonName object to a string
@@ -53,10 +52,6 @@ for root, dirs, files in os.walk(main_folder):
             body_part = find_body_part(ds)
 
             # Populate data structures
-            unique_names.add(patient_name)
-            unique_dates.add(study_date)
-            unique_body_parts.add(body_part)
-            
             name_counts[patient_name] += 1
             date_counts[study_date] += 1
             body_part_counts[body_part] += 1
@@ -76,28 +71,28 @@ else:
 
     # Name Report
     print("\n--- Patient Name Consistency ---")
-    if len(unique_names) == 1:
-        print(f"✅ Consistent Name: {list(unique_names)[0]}")
+    if len(name_counts) == 1:
+        print(f"✅ Consistent Name: {next(iter(name_counts))}")
     else:
-        print(f"⚠️ Inconsistent: Found {len(unique_names)} different names.")
+        print(f"⚠️ Inconsistent: Found {len(name_counts)} different names.")
         for name, count in name_counts.items():
             print(f"   - Name: '{name}' (found in {count} files)")
 
     # Date Report
     print("\n--- Study Date Consistency ---")
-    if len(unique_dates) == 1:
-        print(f"✅ Consistent Date: {list(unique_dates)[0]}")
+    if len(date_counts) == 1:
+        print(f"✅ Consistent Date: {next(iter(date_counts))}")
     else:
-        print(f"⚠️ Inconsistent: Found {len(unique_dates)} different dates.")
+        print(f"⚠️ Inconsistent: Found {len(date_counts)} different dates.")
         for date, count in date_counts.items():
             print(f"   - Date: {date} (found in {count} files)")
 
     # Body Part Report
     print("\n--- Body Part Consistency ---")
-    if len(unique_body_parts) == 1:
-        print(f"✅ Consistent Body Part: {list(unique_body_parts)[0]}")
+    if len(body_part_counts) == 1:
+        print(f"✅ Consistent Body Part: {next(iter(body_part_counts))}")
     else:
-        print(f"⚠️ Inconsistent: Found {len(unique_body_parts)} different body parts.")
+        print(f"⚠️ Inconsistent: Found {len(body_part_counts)} different body parts.")
         for part, count in body_part_counts.items():
             print(f"   - Body Part: '{part}' (found in {count} files)")
 
@@ -105,16 +100,16 @@ else:
     print("\n" + "="*50)
     print("--- FILENAME FEASIBILITY REPORT ---")
 
-    is_name_ok = len(unique_names) == 1 and "Unknown_Name" not in unique_names
-    is_date_ok = len(unique_dates) == 1 and "Unknown_Date" not in unique_dates
+    is_name_ok = len(name_counts) == 1 and "Unknown_Name" not in name_counts
+    is_date_ok = len(date_counts) == 1 and "Unknown_Date" not in date_counts
     
     if is_name_ok and is_date_ok:
         # Get the consistent name and date
-        the_name = list(unique_names)[0]
-        the_date = list(unique_dates)[0]
+        the_name = next(iter(name_counts))
+        the_date = next(iter(date_counts))
         
-        if len(unique_body_parts) == 1:
-            the_body_part = list(unique_body_parts)[0]
+        if len(body_part_counts) == 1:
+            the_body_part = next(iter(body_part_counts))
             print("\n✅ Feasible: All components are consistent.")
             
         else:
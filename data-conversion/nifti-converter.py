@@ -1,6 +1,8 @@
 import os
 import argparse
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from tqdm import tqdm
 import dicom2nifti
 
@@ -12,6 +14,35 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Status lines are printed in batches of this many conversions to limit progress bar redraws
+STATUS_FLUSH_EVERY = 32
+
+def _convert_one(series_dir_name, input_dir, output_dir, overwrite):
+    """
+    Converts one DICOM series folder; runs in a worker process.
+    Returns (series_dir_name, status, message, reason) for the main process to report;
+    reason is the error text of a failed conversion, otherwise None.
+    """
+    dicom_source_path = os.path.join(input_dir, series_dir_name)
+    nifti_output_filename = f"{series_dir_name}.nii.gz"
+    nifti_output_path = os.path.join(output_dir, nifti_output_filename)
+
+    # --- Resumability Check ---
+    # Skip conversion if the file already exists and overwrite is False.
+    if os.path.exists(nifti_output_path) and not overwrite:
+        return series_dir_name, "SKIPPING", f"Output file already exists: {nifti_output_path}", None
+
+    # --- Error Handling ---
+    # Wrap the conversion in a try...except block to handle potential errors gracefully.
+    try:
+        # The core conversion function
+        dicom2nifti.dicom_series_to_nifti(dicom_source_path, nifti_output_path, reorient_nifti=True)
+        return series_dir_name, "SUCCESS", f"Converted '{series_dir_name}' to '{nifti_output_filename}'", None
+    except dicom2nifti.exceptions.ConversionError as e:
+        return series_dir_name, "ERROR", f"Failed to convert {series_dir_name}. Reason: {e}", str(e)
+    except Exception as e:
+        return series_dir_name, "UNEXPECTED ERROR", f"An unknown error occurred for {series_dir_name}. Reason: {e}", str(e)
+
 def convert_dicom_to_nifti(input_dir, output_dir, overwrite=False):
     """
     Scans an input directory for subdirectories (each containing a DICOM series),
@@ -45,32 +76,26 @@ def convert_dicom_to_nifti(input_dir, output_dir, overwrite=False):
     logging.info(f"Found {len(dicom_series_dirs)} potential DICOM series to process.")
 
     # --- Main Conversion Loop ---
+    # Each series is converted in its own worker process; map() yields the results in series order.
     # Use tqdm to create a progress bar for the conversion process.
-    for series_dir_name in tqdm(dicom_series_dirs, desc="Overall Progress"):
-        dicom_source_path = os.path.join(input_dir, series_dir_name)
-        nifti_output_filename = f"{series_dir_name}.nii.gz"
-        nifti_output_path = os.path.join(output_dir, nifti_output_filename)
-
-        tqdm.write(f"\nProcessing: {dicom_source_path}") # tqdm.write is thread-safe for progress bars
-
-        # --- Resumability Check ---
-        # Skip conversion if the file already exists and overwrite is False.
-        if os.path.exists(nifti_output_path) and not overwrite:
-            tqdm.write(f"SKIPPING: Output file already exists: {nifti_output_path}")
-            continue
-
-        # --- Error Handling ---
-        # Wrap the conversion in a try...except block to handle potential errors gracefully.
-        try:
-            # The core conversion function
-            dicom2nifti.dicom_series_to_nifti(dicom_source_path, nifti_output_path, reorient_nifti=True)
-            tqdm.write(f"SUCCESS: Converted '{series_dir_name}' to '{nifti_output_filename}'")
-        except dicom2nifti.exceptions.ConversionError as e:
-            tqdm.write(f"ERROR: Failed to convert {series_dir_name}. Reason: {e}")
-            logging.error(f"Could not convert {dicom_source_path}: {e}")
-        except Exception as e:
-            tqdm.write(f"UNEXPECTED ERROR: An unknown error occurred for {series_dir_name}. Reason: {e}")
-            logging.error(f"An unexpected error occurred for {dicom_source_path}: {e}")
+    convert_one = partial(_convert_one, input_dir=input_dir, output_dir=output_dir, overwrite=overwrite)
+    status_buf = []
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(convert_one, dicom_series_dirs)
+        for series_dir_name, status, message, reason in tqdm(results, total=len(dicom_series_dirs), desc="Overall Progress"):
+            dicom_source_path = os.path.join(input_dir, series_dir_name)
+            status_buf.append(f"\nProcessing: {dicom_source_path}\n{status}: {message}")
+            failed = status in ("ERROR", "UNEXPECTED ERROR")
+            # Errors are shown straight away, together with the buffered lines before them
+            if failed or len(status_buf) >= STATUS_FLUSH_EVERY:
+                tqdm.write("\n".join(status_buf))
+                status_buf.clear()
+            if status == "ERROR":
+                logging.error(f"Could not convert {dicom_source_path}: {reason}")
+            elif status == "UNEXPECTED ERROR":
+                logging.error(f"An unexpected error occurred for {dicom_source_path}: {reason}")
+    if status_buf:
+        tqdm.write("\n".join(status_buf))
 
     logging.info("Conversion process finished.")
 
@@ -1,14 +1,52 @@
 import os
+import errno
+import json
 import shutil
 import re
+import sys
 import logging
+import logging.handlers
+import multiprocessing
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
 from tqdm import tqdm
+import fitz  # PyMuPDF
 import pdfplumber
 
+def _user_cache_dir():
+    """The per-user cache folder of the platform (e.g. %LOCALAPPDATA% on Windows, ~/.cache on Linux)."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'Categorizer', 'sorter_cache')
+
 # --- CONFIGURATION ---
 LOG_FILE = 'categorizer_pdf_reader.log'
 SKIPPED_REPORTS_FILE = 'skipped_reports_final.txt'
+# Name/age/body part read from reports that stay in the source folder, reused on the next run.
+# This is patient data, so it lives in a folder private to the current user.
+PDF_INFO_CACHE_FILE = os.path.join(_user_cache_dir(), 'pdf_info_cache.json')
+# At most this many reports are waiting on the worker processes at once, so memory
+# stays bounded however many PDFs the source folder holds
+MAX_PENDING_PDFS = 256
+# Moves are mostly waiting on the filesystem (a full copy across drives or network shares), so several run at once
+MOVE_THREADS = 16
+# Patient name, age and investigation sit in the top part of the first page
+HEADER_REGION_FRACTION = 0.35
+
+# Folder names look like NAME_PARTS_<age>Y_...; the name ends at the age token
+AGE_TOKEN_RE = re.compile(r'^\d+Y', re.IGNORECASE)
+
+# Report fields read from the first page of each PDF, compiled once for all reports
+NAME_RE = re.compile(r"PATIENT'S NAME\s*:\s*(.*?)\s*AGE\s*/\s*SEX", re.IGNORECASE | re.DOTALL)
+TITLE_RE = re.compile(r'^(mrs|mr|ms|baby)\s*\.?\s*', re.IGNORECASE)
+AGE_RE = re.compile(r"AGE\s*/\s*SEX\s*:\s*(\d{1,3})\s*Y", re.IGNORECASE)
+INVESTIGATION_RE = re.compile(r"INVESTIGATION\s*:\s*(.*)", re.IGNORECASE)
+BODY_PART_RE = re.compile(r'(BRAIN|KUB|THORAX|CHEST|ABDOMEN|NECK|HEAD|SPINE|PNS)', re.IGNORECASE)
 
 # --- SCRIPT ---
 def print_banner():
@@ -44,35 +82,91 @@ def setup_logging():
 def index_patient_folders(destination_dir):
     """
     Scans the destination directory once and creates an index mapping
-    patient names to a list of their folder paths for performance.
+    patient names to a list of their (folder_path, lowercased folder name) pairs for performance.
     """
     print("\n[INFO] Indexing patient folders for faster matching... Please wait.")
     folder_index = {}
-    for dir_name in tqdm(os.listdir(destination_dir), desc="Indexing Folders"):
-        full_path = os.path.join(destination_dir, dir_name)
-        if os.path.isdir(full_path):
-            folder_parts = dir_name.split('_')
-            name_parts = []
-            for part in folder_parts:
-                if re.match(r'^\d+Y', part, re.IGNORECASE):
-                    break
-                name_parts.append(part)
-            
-            folder_name_full = " ".join(name_parts).lower()
-            
-            if folder_name_full not in folder_index:
-                folder_index[folder_name_full] = []
-            folder_index[folder_name_full].append(full_path)
+    # scandir reports the entry type from the directory listing, avoiding an isdir() call per entry
+    with os.scandir(destination_dir) as entries:
+        folder_entries = [entry for entry in entries if entry.is_dir()]
+    for entry in tqdm(folder_entries, desc="Indexing Folders"):
+        name_parts = []
+        for part in entry.name.split('_'):
+            if AGE_TOKEN_RE.match(part):
+                break
+            name_parts.append(part)
+
+        folder_name_full = " ".join(name_parts).lower()
+        # The lowercased folder name is kept for the age check when several folders share a name
+        folder_index.setdefault(folder_name_full, []).append((entry.path, entry.name.lower()))
     print(f"[INFO] Indexing complete. Found {len(folder_index)} unique patient names.")
     return folder_index
 
+def parse_report_fields(text):
+    """Returns (name, age, body_part) found in the first-page text of a report; missing fields are None."""
+    name, age, body_part = None, None, None
+
+    # --- THE FIX IS HERE ---
+    # This regex now correctly looks for the name between the 'NAME' and 'AGE' fields,
+    # which is a more reliable pattern than looking for the 'DATE' field.
+    name_match = NAME_RE.search(text)
+    if name_match:
+        name = name_match.group(1).strip()
+        # Clean titles like MR., MRS., etc.
+        name = TITLE_RE.sub('', name).strip()
+
+    # Extract Age (allows for spaces around the '/')
+    age_match = AGE_RE.search(text)
+    if age_match:
+        age = age_match.group(1).strip()
+
+    # Extract Investigation (Body Part)
+    investigation_match = INVESTIGATION_RE.search(text)
+    if investigation_match:
+        body_part_text = investigation_match.group(1).strip()
+        # Extract the main keyword like BRAIN, KUB, etc.
+        match = BODY_PART_RE.search(body_part_text)
+        if match:
+            body_part = match.group(1)
+
+    return name, age, body_part
+
+def mupdf_report_fields(pdf_path):
+    """
+    Returns (name, age, body_part) read from the first page with PyMuPDF, or None if the PDF has no pages.
+    Only the header region is extracted first; the full page is read when a field is missing there.
+    """
+    with fitz.open(pdf_path) as doc:
+        if doc.page_count == 0:
+            return None
+        page = doc[0]
+        header = fitz.Rect(0, 0, page.rect.width, page.rect.height * HEADER_REGION_FRACTION)
+        # sort=True reads blocks top-to-bottom, left-to-right, like pdfplumber's layout order
+        fields = parse_report_fields(page.get_text("text", clip=header, sort=True))
+        if all(fields):
+            return fields
+        return parse_report_fields(page.get_text("text", sort=True))
+
 def extract_info_from_pdf(pdf_path):
     """
     Extracts patient name, age, and body part directly from the PDF content.
     This is now the primary source of information.
+    The first page is read with PyMuPDF; pdfplumber (much slower) is only used when
+    MuPDF rejects the file or its text does not yield a name and age.
     """
     try:
-        with pdfplumber.open(pdf_path) as pdf:
+        fields = mupdf_report_fields(pdf_path)
+    except Exception:
+        fields = None
+    if fields:
+        name, age, body_part = fields
+        if name and age:
+            logging.info(f"PDF Read Success: Name='{name}', Age='{age}', Body Part='{body_part}' from '{os.path.basename(pdf_path)}'")
+            return name, age, body_part
+
+    try:
+        # Only the first page holds the patient details, so no other page is loaded
+        with pdfplumber.open(pdf_path, pages=[1]) as pdf:
             if not pdf.pages:
                 logging.warning(f"PDF has no pages: '{os.path.basename(pdf_path)}'")
                 return None, None, None
@@ -82,30 +176,7 @@ def extract_info_from_pdf(pdf_path):
                 logging.warning(f"Could not extract text from: '{os.path.basename(pdf_path)}'")
                 return None, None, None
 
-            name, age, body_part = None, None, None
-
-            # --- THE FIX IS HERE ---
-            # This regex now correctly looks for the name between the 'NAME' and 'AGE' fields,
-            # which is a more reliable pattern than looking for the 'DATE' field.
-            name_match = re.search(r"PATIENT'S NAME\s*:\s*(.*?)\s*AGE\s*/\s*SEX", text, re.IGNORECASE | re.DOTALL)
-            if name_match:
-                name = name_match.group(1).strip()
-                # Clean titles like MR., MRS., etc.
-                name = re.sub(r'^(mrs|mr|ms|baby)\s*\.?\s*', '', name, flags=re.IGNORECASE).strip()
-
-            # Extract Age (allows for spaces around the '/')
-            age_match = re.search(r"AGE\s*/\s*SEX\s*:\s*(\d{1,3})\s*Y", text, re.IGNORECASE)
-            if age_match:
-                age = age_match.group(1).strip()
-
-            # Extract Investigation (Body Part)
-            investigation_match = re.search(r"INVESTIGATION\s*:\s*(.*)", text, re.IGNORECASE)
-            if investigation_match:
-                body_part_text = investigation_match.group(1).strip()
-                # Extract the main keyword like BRAIN, KUB, etc.
-                match = re.search(r'(BRAIN|KUB|THORAX|CHEST|ABDOMEN|NECK|HEAD|SPINE|PNS)', body_part_text, re.IGNORECASE)
-                if match:
-                    body_part = match.group(1)
+            name, age, body_part = parse_report_fields(text)
 
             if name and age:
                  logging.info(f"PDF Read Success: Name='{name}', Age='{age}', Body Part='{body_part}' from '{os.path.basename(pdf_path)}'")
@@ -123,6 +194,96 @@ def extract_info_from_pdf(pdf_path):
         return None, None, None
 
 
+def load_pdf_info_cache():
+    """Loads the report info saved by the previous run, or an empty cache."""
+    try:
+        with open(PDF_INFO_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_pdf_info_cache(cache):
+    """Saves the report info of the files left in the source folder."""
+    try:
+        os.makedirs(os.path.dirname(PDF_INFO_CACHE_FILE), mode=0o700, exist_ok=True)
+        with open(PDF_INFO_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logging.warning(f"Could not save PDF info cache. Error: {e}")
+
+def _init_pdf_worker(log_queue):
+    """Sends a worker's log records to the main process, which writes them to the log file and console."""
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+def iter_pdf_files(source_dir):
+    """Yields (filename, path) for each PDF directly inside source_dir."""
+    # The whole listing is read before anything is yielded: reports are moved out of source_dir
+    # while this is iterated, and a directory changed mid-scan may skip or repeat entries.
+    # scandir reports the entry type from the directory listing, so folders named *.pdf are skipped without a stat
+    with os.scandir(source_dir) as entries:
+        listing = list(entries)
+    for entry in listing:
+        if entry.name.lower().endswith('.pdf') and entry.is_file():
+            yield entry.name, entry.path
+
+def iter_report_details(executor, pdf_files, cache):
+    """
+    Yields (filename, source_path, cache_key, (name, age, body_part)) for each (filename, path)
+    in pdf_files, in order. Reports found unchanged in the cache are answered directly; the rest are
+    read by the executor's worker processes, with at most MAX_PENDING_PDFS in flight.
+    Only successful reads are cached, so failures are retried on the next run.
+    """
+    pending = deque()
+
+    def finish(report):
+        filename, source_path, cache_key, stamp, info = report
+        if isinstance(info, Future):
+            info = info.result()
+            if info[0] and info[1]:
+                cache[cache_key] = stamp + list(info)
+        return filename, source_path, cache_key, info
+
+    for filename, source_path in pdf_files:
+        cache_key = os.path.abspath(source_path)
+        try:
+            stat = os.stat(source_path)
+        except OSError as e:
+            logging.error(f"Failed to read PDF file '{filename}'. Error: {e}")
+            stamp, info = None, (None, None, None)
+        else:
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            entry = cache.get(cache_key)
+            if entry and entry[:2] == stamp:
+                info = tuple(entry[2:])
+            else:
+                info = executor.submit(extract_info_from_pdf, source_path)
+        pending.append((filename, source_path, cache_key, stamp, info))
+
+        # Hand back finished reports from the front as soon as they are ready, keeping the file order
+        while pending and (len(pending) > MAX_PENDING_PDFS or not isinstance(pending[0][4], Future) or pending[0][4].done()):
+            yield finish(pending.popleft())
+
+    while pending:
+        yield finish(pending.popleft())
+
+
+def move_report(source_path, destination_path, same_device):
+    """
+    Moves a report into its patient folder. Within one filesystem this is a plain
+    rename; shutil.move (which copies the data) is only used across filesystems.
+    """
+    if same_device:
+        try:
+            os.rename(source_path, destination_path)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+    shutil.move(source_path, destination_path)
+
+
 def find_patient_folder(patient_name, age, body_part, folder_index):
     """Finds the patient folder using data extracted ONLY from the PDF."""
     
@@ -134,13 +295,14 @@ def find_patient_folder(patient_name, age, body_part, folder_index):
         return None, f"No folder found for patient '{patient_name}'"
         
     if len(potential_matches) == 1:
-        return potential_matches[0], 'Success'
+        return potential_matches[0][0], 'Success'
 
     # If multiple name matches, filter by age
     logging.info(f"Found {len(potential_matches)} name matches for '{patient_name}'. Verifying with age '{age}'...")
     
-    age_pattern = re.compile(f"_{age}Y", re.IGNORECASE)
-    age_matches = [path for path in potential_matches if age_pattern.search(os.path.basename(path))]
+    # The age marker is a literal, so a lowercase substring test is enough
+    age_marker = f"_{age}y"
+    age_matches = [path for path, folder_name in potential_matches if age_marker in folder_name]
     
     if len(age_matches) >= 1:
         logging.info(f"Found {len(age_matches)} name+age match(es). Selecting the first one.")
@@ -149,50 +311,89 @@ def find_patient_folder(patient_name, age, body_part, folder_index):
          return None, f"Found name matches for '{patient_name}', but none with age '{age}'"
 
 def process_files(source_dir, destination_dir, folder_index):
-    """Processes all PDF files in the source directory using PDF data."""
-    
-    pdf_files_to_process = [f for f in os.listdir(source_dir) if f.lower().endswith('.pdf')]
-    if not pdf_files_to_process:
-        logging.info("No PDF files to process in source directory.")
-        return [], 0
-    
+    """
+    Processes all PDF files in the source directory using PDF data.
+    The PDFs are read in parallel worker processes while the folder is still being listed;
+    matching and moving stay in this process.
+    """
+
     skipped_files = []
     moved_count = 0
-    progress_bar = tqdm(pdf_files_to_process, desc="Categorizing Reports", unit="file", bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]")
-    
-    for filename in progress_bar:
-        progress_bar.set_postfix_str(f"Processing: {filename[:30]}...")
-        source_path = os.path.join(source_dir, filename)
-        
-        patient_name, age, body_part = extract_info_from_pdf(source_path)
-        if not patient_name or not age:
-            skipped_files.append(('PDF Read/Parse Failed', filename))
-            continue
-            
-        matched_folder_path, reason = find_patient_folder(patient_name, age, body_part, folder_index)
-        
-        if not matched_folder_path:
-            skipped_files.append((reason, filename))
-            logging.warning(f"SKIPPED: {reason}. File: '{filename}'")
-            continue
-            
-        if filename in os.listdir(matched_folder_path):
-            reason = 'Target folder already contains this exact report'
-            skipped_files.append((reason, filename))
-            logging.warning(f"SKIPPED: Report '{filename}' already exists in target folder.")
-            continue
+    report_count = 0
+    pdf_info_cache = load_pdf_info_cache()
+    # Patient folders on the same filesystem as the source can take the reports by rename
+    same_device = os.stat(source_dir).st_dev == os.stat(destination_dir).st_dev
+    remaining_cache = {}
 
-        destination_path = os.path.join(matched_folder_path, filename)
-        
-        try:
-            shutil.move(source_path, destination_path)
-            logging.info(f"SUCCESS: Moved '{filename}' to '{os.path.basename(matched_folder_path)}'")
-            moved_count += 1
-        except Exception as e:
-            reason = f'File Move Error: {e}'
-            skipped_files.append((reason, filename))
-            logging.error(f"FAILED to move '{filename}'. Error: {e}")
-            
+    # Worker log records come back through a queue and are written by this process's handlers
+    log_queue = multiprocessing.Queue()
+    log_listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+    log_listener.start()
+    # Moves run on a thread pool; their results are collected here, in the main thread
+    pending_moves = {}
+
+    def collect_moves(done):
+        nonlocal moved_count
+        for future in done:
+            filename, matched_folder_path, cache_key = pending_moves.pop(future)
+            try:
+                future.result()
+                logging.info(f"SUCCESS: Moved '{filename}' to '{os.path.basename(matched_folder_path)}'")
+                moved_count += 1
+                remaining_cache.pop(cache_key, None)
+            except Exception as e:
+                reason = f'File Move Error: {e}'
+                skipped_files.append((reason, filename))
+                logging.error(f"FAILED to move '{filename}'. Error: {e}")
+
+    try:
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_pdf_worker, initargs=(log_queue,)) as executor, \
+                ThreadPoolExecutor(max_workers=MOVE_THREADS) as move_executor:
+            reports = iter_report_details(executor, iter_pdf_files(source_dir), pdf_info_cache)
+            # The number of reports is not known up front, so the bar counts without a total
+            progress_bar = tqdm(reports, desc="Categorizing Reports", unit="file", bar_format="{l_bar}{bar}| {n_fmt} [{elapsed}]")
+
+            for filename, source_path, cache_key, (patient_name, age, body_part) in progress_bar:
+                progress_bar.set_postfix_str(f"Processing: {filename[:30]}...")
+                report_count += 1
+
+                if not patient_name or not age:
+                    skipped_files.append(('PDF Read/Parse Failed', filename))
+                    continue
+
+                # Kept for the next run unless the report is moved out of the source folder below
+                if cache_key in pdf_info_cache:
+                    remaining_cache[cache_key] = pdf_info_cache[cache_key]
+
+                matched_folder_path, reason = find_patient_folder(patient_name, age, body_part, folder_index)
+
+                if not matched_folder_path:
+                    skipped_files.append((reason, filename))
+                    logging.warning(f"SKIPPED: {reason}. File: '{filename}'")
+                    continue
+
+                destination_path = os.path.join(matched_folder_path, filename)
+
+                # A single stat instead of listing the whole target folder for every report
+                if os.path.exists(destination_path):
+                    reason = 'Target folder already contains this exact report'
+                    skipped_files.append((reason, filename))
+                    logging.warning(f"SKIPPED: Report '{filename}' already exists in target folder.")
+                    continue
+
+                move_future = move_executor.submit(move_report, source_path, destination_path, same_device)
+                pending_moves[move_future] = (filename, matched_folder_path, cache_key)
+                if len(pending_moves) >= MOVE_THREADS * 4:
+                    collect_moves(wait(pending_moves, return_when=FIRST_COMPLETED).done)
+            collect_moves(list(pending_moves))
+    finally:
+        log_listener.stop()
+
+    if report_count == 0:
+        logging.info("No PDF files to process in source directory.")
+        return [], 0
+
+    save_pdf_info_cache(remaining_cache)
     return skipped_files, moved_count
 
 def write_skipped_files_report(skipped_list):
@@ -200,10 +401,8 @@ def write_skipped_files_report(skipped_list):
     if not skipped_list:
         return
 
-    grouped_skipped = {}
+    grouped_skipped = defaultdict(list)
     for reason, filename in skipped_list:
-        if reason not in grouped_skipped:
-            grouped_skipped[reason] = []
         grouped_skipped[reason].append(filename)
 
     try:
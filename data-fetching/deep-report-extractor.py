@@ -1,6 +1,9 @@
 import os
-import shutil
+import stat
 import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # --- Configuration ---
@@ -8,48 +11,59 @@ from pathlib import Path
 # This assumes 'index.txt' is in the same folder as the script.
 # You can change this to an absolute path if needed, e.g., Path(r"C:\MyData\index.txt")
 INDEX_FILE = Path.cwd() / "index.txt" 
+# Reports are read by this many threads while the main thread writes them into the zip
+ZIP_READ_THREADS = 8
+MAX_PENDING_READS = 32
+# PDFs are already compressed internally, so reports are stored as-is instead of deflated again
+ZIP_COMPRESSION = zipfile.ZIP_STORED
 # --- End Configuration ---
 
+def read_report(pdf_path, arcname):
+    """
+    Reads one PDF for the archive; runs in a reader thread.
+    Returns (zip_info, data), where zip_info keeps the file's modification time.
+    """
+    zip_info = zipfile.ZipInfo.from_file(pdf_path, arcname)
+    zip_info.compress_type = ZIP_COMPRESSION
+    return zip_info, pdf_path.read_bytes()
+
+def iter_report_reads(executor, pdf_paths, arcnames):
+    """
+    Submits the reads to the executor and yields (pdf_path, future) in index order,
+    keeping at most MAX_PENDING_READS reads in flight.
+    """
+    pending = deque()
+    for pdf_path, arcname in zip(pdf_paths, arcnames):
+        pending.append((pdf_path, executor.submit(read_report, pdf_path, arcname)))
+        if len(pending) >= MAX_PENDING_READS:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
 def collect_and_zip_reports():
     """
-    Reads a list of PDF paths from index.txt, copies them to a temporary
-    directory, and zips them up.
+    Reads a list of PDF paths from index.txt and writes them straight
+    into a zip file, without copying them to a temporary folder first.
     """
     
     # Get the directory where the script is running
-    # This is where the temp folder and final zip will be created
+    # This is where the final zip will be created
     script_dir = Path.cwd()
     
-    # 1. Define temporary folder and zip file names with a timestamp
+    # 1. Define the zip file name with a timestamp
     timestamp = time.strftime("%Y%m%d_%H%M%S")
-    temp_folder_name = f"temp_pdf_reports_{timestamp}"
-    temp_folder_path = script_dir / temp_folder_name
-    
-    zip_file_name = f"all_reports_{timestamp}"
-    # The full path to the zip file, but without the .zip extension
-    # shutil.make_archive will add it automatically
-    zip_base_path = script_dir / zip_file_name
+    zip_file_path = script_dir / f"all_reports_{timestamp}.zip"
 
     print(f"Script running in: {script_dir}")
     print(f"Using index file: {INDEX_FILE}")
-    print(f"Temporary folder will be: {temp_folder_path}")
-    print(f"Final ZIP file will be: {zip_base_path}.zip")
+    print(f"Final ZIP file will be: {zip_file_path}")
 
-    # 2. Create the temporary folder
-    try:
-        temp_folder_path.mkdir(parents=True, exist_ok=True)
-        print("\nStep 1: Created temporary folder.")
-    except Exception as e:
-        print(f"Error: Could not create temporary folder: {e}")
-        return
-
-    # 3. Collect all PDF file paths from the index file
-    print("Step 2: Reading PDF paths from index file...")
+    # 2. Collect all PDF file paths from the index file
+    print("\nStep 1: Reading PDF paths from index file...")
     pdf_files_to_copy = []
     
     if not INDEX_FILE.exists():
         print(f"Error: Index file not found at {INDEX_FILE}")
-        shutil.rmtree(temp_folder_path) # Clean up temp folder
         return
 
     missing_files = 0
@@ -63,7 +77,13 @@ def collect_and_zip_reports():
 
             pdf_path = Path(file_path_str)
             
-            if pdf_path.exists() and pdf_path.is_file():
+            # One stat call answers both "does it exist" and "is it a regular file"
+            try:
+                is_file = stat.S_ISREG(os.stat(file_path_str).st_mode)
+            except OSError:
+                is_file = False
+
+            if is_file:
                 pdf_files_to_copy.append(pdf_path)
             else:
                 print(f"  - Warning: File not found or is not a file: {pdf_path}")
@@ -73,75 +93,62 @@ def collect_and_zip_reports():
         print(f"  - Total files from index that are missing: {missing_files}")
 
     if not pdf_files_to_copy:
-        print("\nNo valid PDF files found from the index. Cleaning up empty temp folder.")
-        shutil.rmtree(temp_folder_path)
+        print("\nNo valid PDF files found from the index.")
         print("Done.")
         return
 
-    print(f"\nTotal PDF files to copy: {len(pdf_files_to_copy)}")
+    print(f"\nTotal PDF files to archive: {len(pdf_files_to_copy)}")
 
-    # 4. Copy files to the temporary folder, handling name collisions
-    print("Step 3: Copying files to temporary folder...")
+    # 3. Give every file a unique name inside the archive
+    # Handle filename collisions (e.g., two "report.pdf" files) as "report (1).pdf";
+    # names are compared case-insensitively so the archive also extracts cleanly on Windows
+    used_names = set()
+    arcnames = []
+    for pdf_path in pdf_files_to_copy:
+        arcname = pdf_path.name
+        counter = 1
+        while arcname.lower() in used_names:
+            arcname = f"{pdf_path.stem} ({counter}){pdf_path.suffix}"
+            counter += 1
+        used_names.add(arcname.lower())
+        arcnames.append(arcname)
+
+    # 4. Read the files on a thread pool and write them into the ZIP file as they arrive
+    # Reads overlap with the writes; at most MAX_PENDING_READS files are held in memory at once
+    print("Step 2: Writing files into the ZIP file...")
     copied_count = 0
     failed_count = 0
 
-    for pdf_path in pdf_files_to_copy:
-        try:
-            dest_path = temp_folder_path / pdf_path.name
-            
-            # Handle filename collisions (e.g., two "report.pdf" files)
-            counter = 1
-            while dest_path.exists():
-                # Create a new name, e.g., "report (1).pdf"
-                new_name = f"{pdf_path.stem} ({counter}){pdf_path.suffix}"
-                dest_path = temp_folder_path / new_name
-                counter += 1
-                
-            shutil.copy2(pdf_path, dest_path)
-            copied_count += 1
-
-            if copied_count % 100 == 0:
-                print(f"  ... copied {copied_count} files ...")
-
-        except Exception as e:
-            print(f"  - Failed to copy {pdf_path}: {e}")
-            failed_count += 1
-
-    print(f"\nCopy complete. Successfully copied: {copied_count}, Failed: {failed_count}")
-
-    if copied_count == 0:
-        print("No files were successfully copied. Aborting zip process.")
-        shutil.rmtree(temp_folder_path)
-        print("Cleaned up temp folder.")
-        return
-
-    # 5. Create the ZIP file
-    print("Step 4: Creating ZIP file...")
     try:
-        archive_path = shutil.make_archive(
-            base_name=zip_base_path,  # The path/name of the archive, minus extension
-            format='zip',             # The archive format
-            root_dir=temp_folder_path # The directory to zip
-        )
-        print(f"Successfully created ZIP file: {archive_path}")
-    
+        with zipfile.ZipFile(zip_file_path, 'w', ZIP_COMPRESSION) as zf, \
+                ThreadPoolExecutor(max_workers=ZIP_READ_THREADS) as executor:
+            for pdf_path, future in iter_report_reads(executor, pdf_files_to_copy, arcnames):
+                try:
+                    zip_info, data = future.result()
+                except Exception as e:
+                    print(f"  - Failed to read {pdf_path}: {e}")
+                    failed_count += 1
+                    continue
+
+                zf.writestr(zip_info, data)
+                copied_count += 1
+
+                if copied_count % 100 == 0:
+                    print(f"  ... archived {copied_count} files ...")
+
     except Exception as e:
         print(f"Error: Could not create ZIP file: {e}")
-        # Cleanup is skipped if zipping fails
-        print(f"IMPORTANT: Temporary folder {temp_folder_path} was NOT deleted due to zip failure.")
-        print("Please inspect the folder and zip manually if needed.")
-
-    else:
-        # 6. Clean up (remove) the temporary folder
-        # This 'else' block only runs if the 'try' block above succeeded
-        print("Step 5: Cleaning up temporary folder...")
-        try:
-            shutil.rmtree(temp_folder_path)
-            print("Cleanup successful.")
-        except Exception as e:
-            print(f"Error: Could not remove temporary folder: {temp_folder_path}")
-            print("Please remove it manually.")
+        print(f"IMPORTANT: {zip_file_path} may be incomplete. Please inspect it or rerun the script.")
+        return
+
+    print(f"\nArchiving complete. Successfully archived: {copied_count}, Failed: {failed_count}")
+
+    if copied_count == 0:
+        print("No files were successfully archived. Removing the empty ZIP file.")
+        zip_file_path.unlink(missing_ok=True)
+        return
 
+    print(f"Successfully created ZIP file: {zip_file_path}")
     print("\n--- All tasks complete. ---")
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
 import os
 import base64
+import queue
+import re
 import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -16,25 +23,155 @@ DELETE_SOURCE_DOC_AFTER_CONVERSION = True
 # ------------------------------------
 
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
+# One case-insensitive scan of the filename finds any of the keywords; None (no keywords) matches no file
+KEYWORD_RE = re.compile("|".join(re.escape(k) for k in BODY_PART_KEYWORDS), re.IGNORECASE) if BODY_PART_KEYWORDS else None
+# messages.get calls sent per batched HTTP request; Gmail allows 100 but throttles batches above 50
+MESSAGES_PER_BATCH = 50
+# Messages refused for rate limits (429) or server errors (5xx) are fetched again this many times,
+# waiting BATCH_RETRY_DELAY_SECONDS, then twice as long, and so on between attempts
+BATCH_RETRIES = 5
+BATCH_RETRY_DELAY_SECONDS = 1
+# Only these response fields are requested; the rest of each message (headers, bodies, snippet) is never sent
+MESSAGE_FIELDS = 'payload/parts(filename,body/attachmentId)'
+LIST_FIELDS = 'messages/id,nextPageToken'
+# Attachments are downloaded by this many threads while the emails are still being scanned
+DOWNLOAD_THREADS = 16
+# Documents handed to one soffice run; LibreOffice's start-up cost is paid once per batch instead of once per file
+CONVERT_BATCH_SIZE = 10
+# Attachments are base64-decoded into the file this many characters at a time (a multiple of 4)
+DECODE_CHUNK_CHARS = 1 << 20
+# soffice runs converting batches side by side
+CONVERT_WORKERS = os.cpu_count() or 1
+# Each soffice run gets a private LibreOffice profile (this path plus a worker number): runs sharing
+# a profile block each other, and an open LibreOffice window would otherwise swallow the conversions
+LIBREOFFICE_PROFILE_DIR = os.path.join(tempfile.gettempdir(), 'email_downloader_lo_profile')
 
-def convert_with_libreoffice(source_path, output_dir):
-    """Converts a document to PDF using the LibreOffice command line."""
+def convert_with_libreoffice(source_paths, output_dir, profile_dir):
+    """
+    Converts a batch of documents to PDF with a single LibreOffice command line run,
+    using the LibreOffice profile in profile_dir.
+    Returns the set of source paths whose PDF was written.
+    """
     try:
         command = [
             "soffice",
             "--headless",
+            f"-env:UserInstallation={Path(profile_dir).as_uri()}",
             "--convert-to", "pdf",
             "--outdir", output_dir,
-            source_path
+            *source_paths
         ]
         subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return True
     except FileNotFoundError:
         tqdm.write("  ❌ ERROR: 'soffice' command not found. Is LibreOffice installed and in your system's PATH?")
-        return False
+        return set()
     except subprocess.CalledProcessError as e:
-        tqdm.write(f"  ❌ ERROR: LibreOffice conversion failed for {os.path.basename(source_path)}. Error: {e.stderr.decode('utf-8', errors='ignore')}")
+        names = ", ".join(os.path.basename(path) for path in source_paths)
+        tqdm.write(f"  ❌ ERROR: LibreOffice conversion failed for {names}. Error: {e.stderr.decode('utf-8', errors='ignore')}")
+
+    # soffice carries on past documents it cannot open, so each PDF is checked for separately
+    return {path for path in source_paths
+            if os.path.exists(os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + '.pdf'))}
+
+def convert_documents(documents, profile_dirs):
+    """
+    Converts a batch of downloaded (filename, source_doc_path, final_pdf_path) documents and reports each one;
+    runs in a conversion thread, borrowing a free LibreOffice profile from the profile_dirs queue.
+    """
+    tqdm.write(f"  Converting {len(documents)} document(s) with LibreOffice...")
+    profile_dir = profile_dirs.get()
+    try:
+        converted = convert_with_libreoffice([source_doc_path for _, source_doc_path, _ in documents], DOWNLOAD_DIR, profile_dir)
+    finally:
+        profile_dirs.put(profile_dir)
+
+    # The batch's results are written together so they do not interleave with other conversion threads
+    lines = []
+    for filename, source_doc_path, final_pdf_path in documents:
+        if source_doc_path in converted:
+            lines.append(f"  ✅ Success: Converted and saved '{os.path.basename(final_pdf_path)}'.")
+            if DELETE_SOURCE_DOC_AFTER_CONVERSION:
+                os.remove(source_doc_path)
+                lines.append(f"  🗑️ Deleted source file: '{filename}'.")
+        else:
+            lines.append(f"  ⚠️ Kept source file '{filename}' due to conversion failure.")
+    tqdm.write("\n".join(lines))
+
+def is_retryable(error):
+    """
+    True for errors that clear up when the request is repeated later: rate limits, server errors,
+    and transport errors such as timeouts or dropped connections.
+    """
+    if error is None:
         return False
+    if not isinstance(error, HttpError):
+        return True
+    status = error.resp.status
+    return status == 429 or status >= 500 or (status == 403 and 'ratelimitexceeded' in str(error).lower())
+
+def fetch_messages(service, message_ids):
+    """
+    Fetches the given messages with one batched HTTP request, retrying the ones refused
+    for rate limits, server or transport errors with exponential backoff.
+    Returns a list of (message_id, message, error) in the order of message_ids; a message
+    that still fails after the last retry carries its error instead of raising.
+    """
+    results = {}
+
+    def on_message(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    to_fetch = message_ids
+    for attempt in range(BATCH_RETRIES + 1):
+        if attempt:
+            time.sleep(BATCH_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+
+        batch = service.new_batch_http_request(callback=on_message)
+        for message_id in to_fetch:
+            batch.add(service.users().messages().get(userId='me', id=message_id, fields=MESSAGE_FIELDS), request_id=message_id)
+        try:
+            batch.execute()
+        except Exception as e:
+            # The whole batch failed (refused, timed out, connection lost); every message
+            # without an answer of its own gets the batch error and is retried if it is retryable
+            for message_id in to_fetch:
+                if message_id not in results or is_retryable(results[message_id][1]):
+                    results[message_id] = (None, e)
+
+        to_fetch = [message_id for message_id in to_fetch if is_retryable(results[message_id][1])]
+        if not to_fetch:
+            break
+
+    return [(message_id, *results[message_id]) for message_id in message_ids]
+
+def iter_messages(service, all_messages):
+    """Yields (message_id, message, error) for every listed message, fetching MESSAGES_PER_BATCH at a time."""
+    for start in range(0, len(all_messages), MESSAGES_PER_BATCH):
+        message_ids = [msg['id'] for msg in all_messages[start:start + MESSAGES_PER_BATCH]]
+        yield from fetch_messages(service, message_ids)
+
+# The Gmail client is not thread-safe, so each download thread builds its own
+_thread_state = threading.local()
+
+def _thread_service(creds):
+    """Returns this thread's Gmail service."""
+    service = getattr(_thread_state, 'service', None)
+    if service is None:
+        service = _thread_state.service = build('gmail', 'v1', credentials=creds, cache_discovery=False)
+    return service
+
+def download_attachment(creds, msg_id, attachment_id, source_doc_path):
+    """Downloads one attachment and writes it to source_doc_path; runs in a download thread."""
+    service = _thread_service(creds)
+    attachment = service.users().messages().attachments().get(
+        userId='me', messageId=msg_id, id=attachment_id
+    ).execute()
+
+    # Decoding chunk by chunk keeps only the base64 text and one decoded chunk in memory
+    data = attachment['data']
+    with open(source_doc_path, 'wb') as f:
+        for start in range(0, len(data), DECODE_CHUNK_CHARS):
+            f.write(base64.urlsafe_b64decode(data[start:start + DECODE_CHUNK_CHARS]))
 
 def main():
     """Authenticates, searches, filters, downloads, and converts documents."""
@@ -63,7 +200,7 @@ def main():
         page_token = None
         print("Finding all matching messages (this may take a moment)...")
         while True:
-            request = service.users().messages().list(userId='me', q=SEARCH_QUERY, pageToken=page_token)
+            request = service.users().messages().list(userId='me', q=SEARCH_QUERY, pageToken=page_token, fields=LIST_FIELDS)
             response = request.execute()
             messages = response.get('messages', [])
             all_messages.extend(messages)
@@ -79,49 +216,70 @@ def main():
 
         print(f"Found {len(all_messages)} total messages with DOC/DOCX attachments. Filtering and processing now...")
         
-        for msg in tqdm(all_messages, desc="Processing Emails"):
-            try:
-                txt = service.users().messages().get(userId='me', id=msg['id']).execute()
-                
-                for part in txt['payload']['parts']:
-                    filename = part.get('filename')
-                    if not filename:
-                        continue
-                    
-                    is_document = filename.lower().endswith(('.doc', '.docx'))
-                    contains_keyword = any(keyword.lower() in filename.lower() for keyword in BODY_PART_KEYWORDS)
-
-                    if is_document and contains_keyword:
-                        source_doc_path = os.path.join(DOWNLOAD_DIR, filename)
-                        final_pdf_path = os.path.splitext(source_doc_path)[0] + '.pdf'
-
-                        if os.path.exists(final_pdf_path):
-                            continue
+        # Attachments download in the background while the emails are scanned; finished downloads
+        # are then converted in batches by CONVERT_WORKERS soffice runs, each with its own profile
+        downloads = {}
+        queued_pdfs = set()
+        profile_dirs = queue.Queue()
+        for worker in range(CONVERT_WORKERS):
+            profile_dirs.put(f"{LIBREOFFICE_PROFILE_DIR}_{worker}")
+        conversions = []
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_THREADS) as executor, \
+                ThreadPoolExecutor(max_workers=CONVERT_WORKERS) as converter:
+            # Messages are fetched in batches, one HTTP round trip per MESSAGES_PER_BATCH messages
+            messages = iter_messages(service, all_messages)
+            for msg_id, txt, error in tqdm(messages, total=len(all_messages), desc="Processing Emails"):
+                if error is not None:
+                    tqdm.write(f"  ❌ Error processing message {msg_id}: {error}")
+                    continue
 
-                        attachment_id = part['body'].get('attachmentId')
-                        attachment = service.users().messages().attachments().get(
-                            userId='me', messageId=msg['id'], id=attachment_id
-                        ).execute()
+                try:
+                    for part in txt['payload']['parts']:
+                        filename = part.get('filename')
+                        if not filename:
+                            continue
                         
-                        file_data = base64.urlsafe_b64decode(attachment['data'].encode('UTF-8'))
+                        is_document = filename.lower().endswith(('.doc', '.docx'))
+                        contains_keyword = KEYWORD_RE is not None and KEYWORD_RE.search(filename) is not None
 
-                        with open(source_doc_path, 'wb') as f:
-                            f.write(file_data)
-                        
-                        tqdm.write(f"  Downloaded '{filename}'. Converting with LibreOffice...")
-                        
-                        success = convert_with_libreoffice(source_doc_path, DOWNLOAD_DIR)
-
-                        if success:
-                            tqdm.write(f"  ✅ Success: Converted and saved '{os.path.basename(final_pdf_path)}'.")
-                            if DELETE_SOURCE_DOC_AFTER_CONVERSION:
-                                os.remove(source_doc_path)
-                                tqdm.write(f"  🗑️ Deleted source file: '{filename}'.")
-                        else:
-                            tqdm.write(f"  ⚠️ Kept source file '{filename}' due to conversion failure.")
-
-            except Exception as e:
-                tqdm.write(f"  ❌ Error processing message {msg['id']}: {e}")
+                        if is_document and contains_keyword:
+                            source_doc_path = os.path.join(DOWNLOAD_DIR, filename)
+                            final_pdf_path = os.path.splitext(source_doc_path)[0] + '.pdf'
+
+                            # A document attached to several emails (or as both .doc and .docx) is fetched once
+                            if final_pdf_path in queued_pdfs or os.path.exists(final_pdf_path):
+                                continue
+                            queued_pdfs.add(final_pdf_path)
+
+                            attachment_id = part['body'].get('attachmentId')
+                            future = executor.submit(download_attachment, creds, msg_id, attachment_id, source_doc_path)
+                            downloads[future] = (msg_id, filename, source_doc_path, final_pdf_path)
+
+                except Exception as e:
+                    tqdm.write(f"  ❌ Error processing message {msg_id}: {e}")
+
+            # Finished downloads are converted CONVERT_BATCH_SIZE at a time
+            pending_conversions = []
+            for future in tqdm(as_completed(downloads), total=len(downloads), desc="Downloading Attachments"):
+                msg_id, filename, source_doc_path, final_pdf_path = downloads[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    tqdm.write(f"  ❌ Error downloading '{filename}' from message {msg_id}: {e}")
+                    continue
+
+                tqdm.write(f"  Downloaded '{filename}'.")
+                pending_conversions.append((filename, source_doc_path, final_pdf_path))
+                if len(pending_conversions) >= CONVERT_BATCH_SIZE:
+                    conversions.append(converter.submit(convert_documents, pending_conversions, profile_dirs))
+                    pending_conversions = []
+
+            if pending_conversions:
+                conversions.append(converter.submit(convert_documents, pending_conversions, profile_dirs))
+
+            # Surfaces any error raised inside a conversion thread
+            for conversion in conversions:
+                conversion.result()
 
     except HttpError as error:
         print(f'An error occurred: {error}')
@@ -3,6 +3,7 @@ import pypdf
 import re
 import shutil
 import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict, Tuple, List, Optional, Any
 
@@ -20,6 +21,14 @@ PDF_REPORT_DIRS = [
 # Log file to record successes and failures
 LOG_FILE = Path("./matching_log.txt")
 
+# The only DICOM tags the index needs; dcmread skips parsing every other element
+DICOM_INDEX_TAGS = ['PatientName', 'PatientAge', 'PatientSex', 'Modality', 'BodyPartExamined']
+
+# PDF text extraction is CPU-bound, so reports are read by one worker process per core,
+# handed out this many at a time; copies are I/O-bound and run on threads
+PDF_CHUNKSIZE = 32
+COPY_THREADS = 8
+
 # --- 2. REGEX: PDF DATA EXTRACTION ---
 # These are built from your sample.
 # They are the most fragile part and may need tuning if your PDF layouts vary.
@@ -85,6 +94,17 @@ def extract_data_from_pdf(pdf_path: Path) -> Optional[Dict[str, str]]:
         return None
 
 
+def copy_after(previous_copy: Optional[Future], source: Path, destination: Path) -> None:
+    """
+    Copies source to destination once previous_copy (an earlier copy to the same destination) has finished,
+    so reports with the same filename are written one after another and the last one wins.
+    """
+    if previous_copy is not None:
+        wait([previous_copy])
+    # Use copy2 to preserve file metadata (like creation time)
+    shutil.copy2(source, destination)
+
+
 # --- 4. CORE LOGIC: PHASE 1 (INDEXING) ---
 
 def index_dicom_folders(
@@ -111,8 +131,9 @@ def index_dicom_folders(
         if dcm_file:
             try:
                 # CRITICAL EFFICIENCY: stop_before_pixels=True
-                # This reads *only* the header (tags), not the heavy image data.
-                ds = pydicom.dcmread(dcm_file, stop_before_pixels=True)
+                # This reads *only* the header (tags), not the heavy image data,
+                # and specific_tags parses only the five tags used for the key and the check.
+                ds = pydicom.dcmread(dcm_file, stop_before_pixels=True, specific_tags=DICOM_INDEX_TAGS)
                 
                 # Get tags safely
                 name = getattr(ds, 'PatientName', None)
@@ -164,13 +185,22 @@ def process_pdf_reports(
     unmatched_count = 0
     log_entries = []
 
+    # Collect every report first so they can be read in parallel
+    pdf_paths = []
     for pdf_dir in pdf_dirs:
         print(f"\nScanning PDF folder: {pdf_dir}")
         # Use rglob to find all .pdf files in this folder and all subfolders
-        for pdf_path in pdf_dir.rglob('*.pdf'):
-            # 1. Extract data from PDF
-            pdf_data = extract_data_from_pdf(pdf_path)
-            
+        pdf_paths.extend(pdf_dir.rglob('*.pdf'))
+
+    # Copies finish in the background; their log lines are filled in at these positions afterwards
+    pending_copies = []
+    # The latest copy submitted for each destination file, which the next copy to it waits for
+    last_copy_to = {}
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor, \
+            ThreadPoolExecutor(max_workers=COPY_THREADS) as copier:
+        # 1. Extract data from the PDFs in worker processes; map() yields the results in report order
+        for pdf_path, pdf_data in zip(pdf_paths, executor.map(extract_data_from_pdf, pdf_paths, chunksize=PDF_CHUNKSIZE)):
             if not pdf_data:
                 log_entries.append(f"[FAIL] {pdf_path.name}: Could not extract data (check PDF format/regex).")
                 unmatched_count += 1
@@ -192,19 +222,14 @@ def process_pdf_reports(
                 # Check that Modality matches AND PDF body part is in DICOM body part
                 # (e.g., PDF "ABDOMEN" is in DICOM "ABDOMEN" or "ABDOMEN PELVIS")
                 if pdf_mod == dicom_mod and pdf_body in dicom_body:
-                    # 5. SUCCESS: Copy the file
-                    try:
-                        dest_folder = dicom_match["path"]
-                        dest_file = dest_folder / pdf_path.name
-                        
-                        # Use copy2 to preserve file metadata (like creation time)
-                        shutil.copy2(pdf_path, dest_file)
-                        
-                        log_entries.append(f"[SUCCESS] {pdf_path.name} -> {dest_file}")
-                        matched_count += 1
-                    except Exception as e:
-                        log_entries.append(f"[FAIL] {pdf_path.name}: Matched but FAILED TO COPY. Error: {e}")
-                        unmatched_count += 1
+                    # 5. SUCCESS: Copy the file on a copy thread
+                    dest_folder = dicom_match["path"]
+                    dest_file = dest_folder / pdf_path.name
+                    
+                    future = copier.submit(copy_after, last_copy_to.get(dest_file), pdf_path, dest_file)
+                    last_copy_to[dest_file] = future
+                    pending_copies.append((len(log_entries), pdf_path, dest_file, future))
+                    log_entries.append(None)
                 else:
                     # Key matched, but secondary check failed
                     log_entries.append(f"[FAIL] {pdf_path.name}: Key match, but secondary check failed. PDF({pdf_mod}/{pdf_body}) vs DICOM({dicom_mod}/{dicom_body})")
@@ -213,6 +238,15 @@ def process_pdf_reports(
                 # 4. NO MATCH in index
                 log_entries.append(f"[FAIL] {pdf_path.name}: No DICOM patient found for key: {pdf_key}")
                 unmatched_count += 1
+
+        for entry_index, pdf_path, dest_file, future in pending_copies:
+            try:
+                future.result()
+                log_entries[entry_index] = f"[SUCCESS] {pdf_path.name} -> {dest_file}"
+                matched_count += 1
+            except Exception as e:
+                log_entries[entry_index] = f"[FAIL] {pdf_path.name}: Matched but FAILED TO COPY. Error: {e}"
+                unmatched_count += 1
                 
     # --- 6. REPORTING ---
     print("\n--- PDF Matching Complete ---")
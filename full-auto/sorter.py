@@ -10,6 +10,12 @@ import configparser
 # Set the number of days to search back in time from the report's date.
 DATE_SEARCH_RANGE_DAYS = 7
 LOG_FILE = 'categorizer.log'
+# Report filenames look like Report_of_<name>_..._<day>_<month><year>.pdf; compiled once for all files
+FILENAME_RE = re.compile(r'Report_of_(.+?)_.*?(\d{1,2})_([a-zA-Z]+)(\d{2,4})\.pdf')
+MONTH_MAP = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
 
 # --- SCRIPT ---
 def print_banner():
@@ -41,22 +47,17 @@ def setup_logging():
     print("[INFO] Logging started.")
 
 def parse_filename(filename):
-    pattern = re.compile(r'Report_of_(.+?)_.*?(\d{1,2})_([a-zA-Z]+)(\d{2,4})\.pdf')
-    match = pattern.match(filename)
+    match = FILENAME_RE.match(filename)
     if not match:
         logging.warning(f"Filename did not match expected pattern: {filename}")
         print(f"[WARNING] Filename did not match expected pattern: {filename}")
         return None, None
-    month_map = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
     try:
         name = match.group(1).strip().lower()
         day = int(match.group(2))
         month_str = match.group(3).lower()[:3]
         year_str = match.group(4)
-        month = month_map.get(month_str)
+        month = MONTH_MAP.get(month_str)
         if not month:
             logging.warning(f"Unrecognized month '{month_str}' in file: {filename}")
             print(f"[WARNING] Unrecognized month '{month_str}' in file: {filename}")
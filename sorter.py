@@ -2,6 +2,7 @@ import os
 import shutil
 import re
 import logging
+import functools
 from datetime import datetime, timedelta
 from tqdm import tqdm
 
@@ -10,6 +11,14 @@ from tqdm import tqdm
 DATE_SEARCH_RANGE_DAYS = 7
 LOG_FILE = 'categorizer.log'
 SKIPPED_REPORTS_FILE = 'skipped_reports.txt'
+# Everything except letters and whitespace is dropped from folder names before matching
+NON_NAME_CHARS_RE = re.compile(r'[^a-z\s]')
+# Report filenames look like Report_of_<name>_..._<day>_<month>_<year>.pdf; compiled once for all files
+FILENAME_RE = re.compile(r'Report_of_(.+?)_.*?(\d{1,2})_([a-zA-Z]+)_(\d{2,4})\.pdf')
+MONTH_MAP = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
 
 # --- SCRIPT ---
 def print_banner():
@@ -35,22 +44,17 @@ def setup_logging():
     print("[INFO] Logging started.")
 
 def parse_filename(filename):
-    pattern = re.compile(r'Report_of_(.+?)_.*?(\d{1,2})_([a-zA-Z]+)_(\d{2,4})\.pdf')
-    match = pattern.match(filename)
+    match = FILENAME_RE.match(filename)
     if not match:
         logging.warning(f"Filename did not match expected pattern: {filename}")
         print(f"[WARNING] Filename did not match expected pattern: {filename}")
         return None, None
-    month_map = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
     try:
         name = match.group(1).strip().lower()
         day = int(match.group(2))
         month_str = match.group(3).lower()[:3]
         year_str = match.group(4)
-        month = month_map.get(month_str)
+        month = MONTH_MAP.get(month_str)
         if not month:
             logging.warning(f"Unrecognized month '{month_str}' in file: {filename}")
             print(f"[WARNING] Unrecognized month '{month_str}' in file: {filename}")
@@ -65,6 +69,23 @@ def parse_filename(filename):
         print(f"[ERROR] Could not parse date from filename '{filename}': {e}")
         return None, None
 
+@functools.lru_cache(maxsize=None)
+def index_date_folder(date_folder_path):
+    """
+    Lists a date folder once and indexes its patient subfolders by name word.
+    Returns (subfolders, word_index); word_index maps each word to the positions
+    in subfolders of the folders whose name contains it.
+    """
+    subfolders = os.listdir(date_folder_path)
+    word_index = {}
+    for position, subfolder in enumerate(subfolders):
+        # Clean the folder name by removing numbers/symbols and split into words.
+        # e.g., "ABBU HURERA_1.3.12..." -> {'abbu', 'hurera'}
+        folder_text = NON_NAME_CHARS_RE.sub('', subfolder.lower())
+        for word in folder_text.split():
+            word_index.setdefault(word, set()).add(position)
+    return subfolders, word_index
+
 def find_patient_folder(patient_name, report_date, destination_dir):
     # Split the name from the PDF into a set of individual words for matching.
     # e.g., "abbu hurera" -> {'abbu', 'hurera'}
@@ -76,17 +97,21 @@ def find_patient_folder(patient_name, report_date, destination_dir):
         date_folder_path = os.path.join(destination_dir, date_folder_name)
         
         if os.path.exists(date_folder_path):
-            for subfolder in os.listdir(date_folder_path):
-                # Clean the folder name by removing numbers/symbols and split into words.
-                # e.g., "ABBU HURERA_1.3.12..." -> {'abbu', 'hurera'}
-                folder_text = re.sub(r'[^a-z\s]', '', subfolder.lower())
-                folder_words = set(folder_text.split())
-
-                # Check if all words from the PDF name exist in the folder name.
-                if name_words.issubset(folder_words):
-                    logging.info(f"Found match for '{patient_name}' in folder: {os.path.join(date_folder_path, subfolder)}")
-                    print(f"[SUCCESS] Found match for '{patient_name}' in folder: {os.path.join(date_folder_path, subfolder)}")
-                    return os.path.join(date_folder_path, subfolder)
+            subfolders, word_index = index_date_folder(date_folder_path)
+
+            # Folders containing every word from the PDF name, found by intersecting
+            # the folders of each word instead of comparing against every folder.
+            if name_words:
+                matches = set.intersection(*(word_index.get(word, set()) for word in name_words))
+            else:
+                matches = set(range(len(subfolders)))
+
+            if matches:
+                # The earliest listed folder wins, as with a scan in listing order
+                subfolder = subfolders[min(matches)]
+                logging.info(f"Found match for '{patient_name}' in folder: {os.path.join(date_folder_path, subfolder)}")
+                print(f"[SUCCESS] Found match for '{patient_name}' in folder: {os.path.join(date_folder_path, subfolder)}")
+                return os.path.join(date_folder_path, subfolder)
                     
     logging.warning(f"No folder found for '{patient_name}' in the +/- {DATE_SEARCH_RANGE_DAYS} day search range.")
     print(f"[WARNING] No folder found for '{patient_name}' in the +/- {DATE_SEARCH_RANGE_DAYS} day search range.")